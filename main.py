@@ -3,33 +3,49 @@
 main.py - Entry point for DCS Mouse Controller
 """
 
-from utils.controller.detector import InputDetector
+from utils.controller.detector import InputDetector, coalesce_events
 from utils.controller.executor import InputExecutor
 from utils.controller.bindings import InputConfig, KeyMapConfig, AxisMapConfig
 from utils.file.inireader import IniReader
 from utils.controller.keymapper import KeyMapper
 from utils.controller.mousecontroller import MouseController
 from utils.logger.logger import setup_logger
+from utils.timer.waitabletimer import WaitableTimer, begin_timer_resolution, end_timer_resolution
 
+import os
 import sys
+import atexit
 import time
+import asyncio
+import threading
 import ctypes
 import ctypes.wintypes as wt
-from pathlib import Path
 import msvcrt
 import logging
 import argparse
 
 
+_instance_mutex = None
+
+
 def check_single_instance(mutex_name="DCSMouseControllerMutex"):
     """Ensure only one instance of this program runs."""
-    kernel32 = ctypes.windll.kernel32
-    kernel32.CreateMutexW.restype = ctypes.c_void_p
+    global _instance_mutex
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateMutexW.argtypes = [ctypes.c_void_p, wt.BOOL, wt.LPCWSTR]
+    kernel32.CreateMutexW.restype = wt.HANDLE
+    kernel32.CloseHandle.argtypes = [wt.HANDLE]
+    kernel32.CloseHandle.restype = wt.BOOL
+
+    # Clear any stale error so a previous call can't fake ERROR_ALREADY_EXISTS
+    ctypes.set_last_error(0)
     handle = kernel32.CreateMutexW(None, False, mutex_name)
+    last_error = ctypes.get_last_error()
 
     # ERROR_ALREADY_EXISTS = 183
-    last_error = kernel32.GetLastError()
     if last_error == 183:
+        if handle:
+            kernel32.CloseHandle(handle)
         print("Another instance is already running.")
 
 
@@ -37,6 +53,11 @@ def check_single_instance(mutex_name="DCSMouseControllerMutex"):
         msvcrt.getch()
         sys.exit(1)
 
+    # Keep the handle for the process lifetime; release it cleanly on exit
+    _instance_mutex = handle
+    if handle:
+        atexit.register(kernel32.CloseHandle, handle)
+
 # ----------------------------------------------------------------------
 # Window lister helper
 # ----------------------------------------------------------------------
@@ -55,30 +76,30 @@ def list_top_level_windows(log):
     WS_EX_TOOLWINDOW = 0x00000080
 
     EnumWindows = user32.EnumWindows
-    EnumWindowsProc = ctypes.WINFUNCTYPE(ctypes.c_bool, wt.HWND, wt.LPARAM)
-
-    def is_top_level_app(hwnd):
-        if not IsWindowVisible(hwnd):
-            return False
-        if GetWindow(hwnd, GW_OWNER):  # has owner
-            return False
-        ex = GetWindowLongW(hwnd, GWL_EXSTYLE)
-        if ex & WS_EX_TOOLWINDOW:
-            return False
-        return True
-
-    def enum_cb(hwnd, lParam):
-        if not is_top_level_app(hwnd):
-            return True
-        length = GetWindowTextLengthW(hwnd)
-        title_buf = ctypes.create_unicode_buffer(max(1, length + 1))
-        GetWindowTextW(hwnd, title_buf, len(title_buf))
-        class_buf = ctypes.create_unicode_buffer(256)
-        GetClassNameW(hwnd, class_buf, 256)
+    EnumWindowsProc = ctypes.WINFUNCTYPE(wt.BOOL, wt.HWND, wt.LPARAM)
+
+    # Win32 entry points are bound as default args (fast locals in the callback).
+    # Most enumerated HWNDs are hidden, so visibility is checked first and
+    # returns immediately.
+    def enum_cb(hwnd, lParam,
+                _vis=IsWindowVisible, _owner=GetWindow, _exstyle=GetWindowLongW,
+                _textlen=GetWindowTextLengthW, _text=GetWindowTextW, _cls=GetClassNameW,
+                _buf=ctypes.create_unicode_buffer):
+        if not _vis(hwnd):
+            return 1
+        if _owner(hwnd, GW_OWNER):  # has owner
+            return 1
+        if _exstyle(hwnd, GWL_EXSTYLE) & WS_EX_TOOLWINDOW:
+            return 1
+        length = _textlen(hwnd)
+        title_buf = _buf(max(1, length + 1))
+        _text(hwnd, title_buf, len(title_buf))
+        class_buf = _buf(256)
+        _cls(hwnd, class_buf, 256)
         log.info(
             f"[WIN] HWND=0x{hwnd:08X}  CLASS='{class_buf.value}'  TITLE='{title_buf.value}'"
         )
-        return True
+        return 1
 
     log.info("[WIN] Listing top-level windows...")
     EnumWindows(EnumWindowsProc(enum_cb), 0)
@@ -92,30 +113,75 @@ def select_config_file(explicit: str | None, log):
     if explicit:
         return explicit
 
-    # Look for *.ini files in current directory
-    ini_files = sorted(Path(".").glob("*.ini"))
+    # Look for *.ini files in current directory (single scandir pass)
+    with os.scandir(".") as it:
+        ini_files = sorted(e.name for e in it if e.is_file() and e.name.lower().endswith(".ini"))
     if not ini_files:
         log.error("No INI configuration files found in current directory.")
         raise SystemExit(1)
 
     if len(ini_files) == 1:
         log.info(f"Found only one config: {ini_files[0]}")
-        return str(ini_files[0])
+        return ini_files[0]
 
     # Multiple INIs → let user choose
     print("\nAvailable config files:")
     for idx, f in enumerate(ini_files, start=1):
-        print(f"  {idx}. {f.name}")
+        print(f"  {idx}. {f}")
     while True:
         try:
             choice = int(input("Select config file [1-{}]: ".format(len(ini_files))))
             if 1 <= choice <= len(ini_files):
-                return str(ini_files[choice - 1])
+                return ini_files[choice - 1]
         except Exception:
             pass
         print("Invalid choice, try again.")
 
 
+# ----------------------------------------------------------------------
+# Poll thread
+# ----------------------------------------------------------------------
+IDLE_WAIT = 0.1  # max block while nothing happens (keeps threads responsive)
+
+
+def poll_loop(log, make_detector, post, ready, frame_dt):
+    """
+    Producer: poll the detector at frame rate and post each non-empty batch.
+    The detector is built here, so SDL is initialised, pumped and waited on
+    by this thread only; ready(exc) reports the outcome to the dispatcher.
+    A later failure is posted as the exception itself, which ends dispatch_loop.
+    """
+    try:
+        detector = make_detector()
+    except Exception as e:
+        ready(e)  # raised again in dispatch_loop
+        return
+    ready(None)
+
+    timer = WaitableTimer()
+    # event-driven detector blocks in poll() while the sticks are idle
+    wait = IDLE_WAIT if detector.event_driven else 0.0
+    try:
+        next_t = time.perf_counter()
+        while True:
+            events = detector.poll(timeout=wait)
+            if events:
+                post(events)
+
+            # Sleep until the next frame deadline (fixed cadence, no drift)
+            next_t += frame_dt
+            now = time.perf_counter()
+            if next_t > now:
+                timer.sleep(next_t - now)
+            else:
+                next_t = now  # fell behind: don't try to catch up in a burst
+    except Exception as e:
+        log.exception("[POLL] Input polling thread stopped")
+        post(e)  # re-raised by dispatch_loop so the process exits instead of idling
+    finally:
+        timer.close()
+
+
 # ----------------------------------------------------------------------
 # Main runner
 # ----------------------------------------------------------------------
@@ -129,31 +195,103 @@ def run_main(log, cfgfile):
     keymaps = KeyMapConfig.from_ini(cfg, log)
     axismaps = AxisMapConfig.from_ini(cfg, log)
 
-    detector = InputDetector(log, input_cfg, keymaps + axismaps)
     keymapper = KeyMapper(log)
     mouse = MouseController(log)
     executor = InputExecutor(log, keymapper, mouse, input_cfg)
+    executor.compile_bindings(keymaps + axismaps)
 
-    # Count invalid bindings (device not found)
-    invalid = 0
-    for bm in keymaps + axismaps:
-        js = detector._resolve_device(bm.input)
-        if js is None:
-            invalid += 1
+    def make_detector():
+        # runs on the poll thread (see poll_loop)
+        detector = InputDetector(log, input_cfg, keymaps + axismaps)
 
-    log.info(
-        f"Loaded {len(keymaps)} key mappings and {len(axismaps)} axis mappings "
-        f"({invalid} invalid bindings)"
-    )
+        # Count invalid bindings (device not found)
+        invalid = 0
+        for bm in keymaps + axismaps:
+            js = detector._resolve_device(bm.input)
+            if js is None:
+                invalid += 1
 
+        log.info(
+            f"Loaded {len(keymaps)} key mappings and {len(axismaps)} axis mappings "
+            f"({invalid} invalid bindings)"
+        )
+        return detector
 
     frame_dt = 1.0 / max(1, input_cfg.axis_poll_hz)
-    while True:
-        events = detector.poll()
-        for ev in events:
-            executor.handle_event(ev)
-        executor.update()
-        time.sleep(frame_dt)
+    install_event_loop(log)
+    asyncio.run(dispatch_loop(log, make_detector, executor, frame_dt))
+
+
+def install_event_loop(log):
+    """
+    Pick the asyncio loop the executor's timed tasks run on:
+    uvloop when installed (optional, not available on Windows),
+    otherwise the IOCP proactor loop on Windows.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    if uvloop is not None:
+        uvloop.install()
+        log.info("[LOOP] Using uvloop")
+    elif sys.platform == "win32":
+        # already the default since 3.8; pinned so nothing swaps in the selector loop
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+
+async def dispatch_loop(log, make_detector, executor, frame_dt):
+    """Consumer: hand polled events to the executor on the asyncio loop."""
+    loop = asyncio.get_running_loop()
+    inbox = asyncio.Queue()
+    ready = loop.create_future()
+
+    def report_ready(exc):
+        if exc is None:
+            loop.call_soon_threadsafe(ready.set_result, None)
+        else:
+            loop.call_soon_threadsafe(ready.set_exception, exc)
+
+    # Input polling runs on its own thread so slow actions (window focus,
+    # blocking clicks) never delay the next joystick read. That thread also
+    # owns SDL: it builds the detector, so all pumping/waiting happens there.
+    threading.Thread(
+        target=poll_loop,
+        args=(log, make_detector, lambda evs: loop.call_soon_threadsafe(inbox.put_nowait, evs),
+              report_ready, frame_dt),
+        name="input-poll", daemon=True,
+    ).start()
+    await ready  # re-raises a detector start-up failure here
+
+    # Wheel/increment/wiggle/key repeat run as tasks on this loop
+    executor.start()
+    try:
+        while True:
+            events = []
+            if executor.busy():
+                # axis moving → wake every frame to integrate it
+                try:
+                    batch = await asyncio.wait_for(inbox.get(), frame_dt)
+                except asyncio.TimeoutError:
+                    batch = None
+            else:
+                batch = await inbox.get()
+            while batch is not None:
+                if isinstance(batch, Exception):
+                    raise RuntimeError("input polling thread stopped") from batch
+                events.extend(batch)
+                try:
+                    batch = inbox.get_nowait()
+                except asyncio.QueueEmpty:
+                    batch = None
+            # One merged event per continuous axis, digital events in order;
+            # every mouse event of the frame goes out in one SendInput
+            with executor.mousecontroller.batch():
+                for ev in coalesce_events(events):
+                    executor.handle_event(ev)
+                executor.update()
+    finally:
+        executor.stop()
 
 
 
@@ -181,27 +319,35 @@ def main():
     try:
         import pygame
         pygame.init()
-        pygame.joystick.init()
-        count = pygame.joystick.get_count()
-        if count == 0:
-            log.info("[DEVICE] No controllers detected")
-        else:
-            for i in range(count):
-                js = pygame.joystick.Joystick(i); js.init()
-                try:
-                    guid = js.get_guid()
-                except AttributeError:
-                    guid = f"index-{i}"
-                log.info(
-                    f"[DEVICE] Joystick {i}: {js.get_name()} "
-                    f"(GUID={guid}) Buttons={js.get_numbuttons()} Axes={js.get_numaxes()}"
-                )
+        try:
+            pygame.joystick.init()
+            count = pygame.joystick.get_count()
+            if count == 0:
+                log.info("[DEVICE] No controllers detected")
+            else:
+                for i in range(count):
+                    js = pygame.joystick.Joystick(i); js.init()
+                    try:
+                        guid = js.get_guid()
+                    except AttributeError:
+                        guid = f"index-{i}"
+                    log.info(
+                        f"[DEVICE] Joystick {i}: {js.get_name()} "
+                        f"(GUID={guid}) Buttons={js.get_numbuttons()} Axes={js.get_numaxes()}"
+                    )
+        finally:
+            # SDL is brought up again on the input-poll thread, which owns it from then on
+            pygame.quit()
     except Exception as e:
         log.warning(f"[DEVICE] Enumeration failed: {e}")
 
-    # 4) Now select INI and run
+    # 4) Now select INI and run (1 ms scheduler resolution while running)
     cfgfile = select_config_file(args.config, log)
-    run_main(log, cfgfile)
+    begin_timer_resolution(1)
+    try:
+        run_main(log, cfgfile)
+    finally:
+        end_timer_resolution(1)
 
 
 if __name__ == "__main__":
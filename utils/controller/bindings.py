@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Literal
 import re
 
@@ -25,10 +25,19 @@ def split_binding_string(s: str) -> list[str]:
         parts.append(buf)
     return [p.strip() for p in parts if p.strip()]
 
+# ---------------------------------------------------------------
+# Helper: parse an int token, None if it is not one
+# ---------------------------------------------------------------
+def _maybe_int(s: str) -> Optional[int]:
+    try:
+        return int(s)
+    except ValueError:
+        return None
+
 # ---------------------------------------------------------------
 # Dataclasses
 # ---------------------------------------------------------------
-@dataclass
+@dataclass(slots=True, frozen=True)
 class InputBinding:
     device_guid: Optional[str]
     device_index: Optional[int] = None
@@ -38,7 +47,32 @@ class InputBinding:
     threshold: Optional[float] = None
     modifier_layer: bool = False
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class RampParams:
+    """Hold-to-repeat timing of a wheel/increment output, resolved at load time."""
+    init: int               # ticks/s when the hold starts
+    vmax: int               # ticks/s after the ramp
+    ramp_ns: int            # ramp duration
+    axis: str = "x"         # increment only
+    amount: int = 1
+    mode: str = "relative"
+    vmax_interval_ns: int = 0   # tick interval once the ramp is done
+
+    @classmethod
+    def from_output(cls, out: "OutputAction") -> "RampParams":
+        init = max(1, int(out.wheel_init or 5))
+        vmax = max(init, int(out.wheel_max or 30))
+        ramp_ms = max(1, int(out.wheel_accel or 1000))
+        extra = out.extra or {}
+        return cls(
+            init, vmax, ramp_ms * 1_000_000,
+            axis=extra.get("axis", "x"),
+            amount=extra.get("amount", 1),
+            mode=extra.get("mode", "relative"),
+            vmax_interval_ns=1_000_000_000 // vmax,
+        )
+
+@dataclass(slots=True)
 class OutputAction:
     type: Literal[
         "key","mouse_button","mouse_wheel","mouse_axis",
@@ -50,11 +84,18 @@ class OutputAction:
     wheel_max: int = 0
     wheel_accel: int = 0
     extra: Optional[dict] = None
+    ramp: Optional[RampParams] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.type in ("mouse_wheel", "mouse_increment"):
+            self.ramp = RampParams.from_output(self)
 
-@dataclass
+@dataclass(slots=True)
 class BindingMap:
     input: InputBinding
     outputs: list[OutputAction]
+    # (on_release, on_press) handler tuples, filled in by InputExecutor.compile_binding
+    handlers: Optional[tuple] = field(default=None, repr=False, compare=False)
 
 # ---------------------------------------------------------------
 # Input parsing
@@ -166,8 +207,9 @@ def parse_output(action_str: str) -> OutputAction:
     if base.startswith("MB"):
         hold_ms = 30
         # Optional last numeric → hold_ms
-        if parts and parts[-1].isdigit():
-            hold_ms = int(parts[-1])
+        n = _maybe_int(parts[-1]) if parts else None
+        if n is not None:
+            hold_ms = n
             parts = parts[:-1]
         return OutputAction("mouse_button", base, mode, extra={"hold_ms": hold_ms})
 
@@ -239,8 +281,9 @@ def parse_output(action_str: str) -> OutputAction:
 
     # --- Default: Key (with optional ms) ---
     hold_ms = 30
-    if parts and parts[-1].isdigit():
-        hold_ms = int(parts[-1])
+    n = _maybe_int(parts[-1]) if parts else None
+    if n is not None:
+        hold_ms = n
         parts = parts[:-1]
     return OutputAction("key", base, mode, extra={"hold_ms": hold_ms})
 
@@ -255,6 +298,9 @@ class InputConfig:
         self.axis_speed = 400
         self.axis_mode = "relative"
         self.axis_poll_hz = 250
+        self.axis_report_epsilon = 1.0 / 1024  # min axis change worth an event
+        self.pump_hz = 240  # max SDL event pumps per second
+        self.input_mode = "event"  # "event" (wait for SDL events) | "poll"
         # Debug
         self.debug_inputs = False
         self.log_buttons = False
@@ -268,34 +314,40 @@ class InputConfig:
     def from_ini(cls, cfg):
         mod = None
         tog = None
-        if cfg.cfg.has_option("input", "modifier"):
+        if cfg.has_option("input", "modifier"):
             val = cfg.get_str("input", "modifier")
             if val:
                 mod = parse_input(val)
-        if cfg.cfg.has_option("input", "button_toggle"):
+        if cfg.has_option("input", "button_toggle"):
             val = cfg.get_str("input", "button_toggle")
             if val:
                 tog = parse_input(val)
         obj = cls(mod, tog)
 
-        if cfg.cfg.has_option("input", "axis_deadzone"):
+        if cfg.has_option("input", "axis_deadzone"):
             obj.axis_deadzone = float(cfg.get_str("input", "axis_deadzone"))
-        if cfg.cfg.has_option("input", "axis_speed"):
+        if cfg.has_option("input", "axis_speed"):
             obj.axis_speed = float(cfg.get_str("input", "axis_speed"))
-        if cfg.cfg.has_option("input", "axis_mode"):
+        if cfg.has_option("input", "axis_mode"):
             obj.axis_mode = cfg.get_str("input", "axis_mode")
-        if cfg.cfg.has_option("input", "axis_poll_hz"):
+        if cfg.has_option("input", "axis_poll_hz"):
             obj.axis_poll_hz = int(cfg.get_str("input", "axis_poll_hz"))
-
-        if cfg.cfg.has_option("input", "debug_inputs"):
-            obj.debug_inputs = cfg.cfg.getboolean("input", "debug_inputs")
-        if cfg.cfg.has_option("input", "log_buttons"):
-            obj.log_buttons = cfg.cfg.getboolean("input", "log_buttons")
-        if cfg.cfg.has_option("input", "log_axes"):
-            obj.log_axes = cfg.cfg.getboolean("input", "log_axes")
+        if cfg.has_option("input", "axis_report_epsilon"):
+            obj.axis_report_epsilon = float(cfg.get_str("input", "axis_report_epsilon"))
+        if cfg.has_option("input", "pump_hz"):
+            obj.pump_hz = int(cfg.get_str("input", "pump_hz"))
+        if cfg.has_option("input", "input_mode"):
+            obj.input_mode = cfg.get_str("input", "input_mode").lower()
+
+        if cfg.has_option("input", "debug_inputs"):
+            obj.debug_inputs = cfg.get_bool("input", "debug_inputs")
+        if cfg.has_option("input", "log_buttons"):
+            obj.log_buttons = cfg.get_bool("input", "log_buttons")
+        if cfg.has_option("input", "log_axes"):
+            obj.log_axes = cfg.get_bool("input", "log_axes")
 
         # --- wiggle_initially_on with params ---
-        if cfg.cfg.has_option("input", "wiggle_initially_on"):
+        if cfg.has_option("input", "wiggle_initially_on"):
             raw = cfg.get_str("input", "wiggle_initially_on")
             tokens = [t.strip() for t in raw.split(":")]
 
@@ -306,12 +358,14 @@ class InputConfig:
                 obj.wiggle_initially_on = False
 
             # optional amplitude
-            if len(tokens) > 1 and tokens[1].isdigit():
-                obj.wiggle_px = int(tokens[1])
+            n = _maybe_int(tokens[1]) if len(tokens) > 1 else None
+            if n is not None:
+                obj.wiggle_px = n
 
             # optional period
-            if len(tokens) > 2 and tokens[2].isdigit():
-                obj.wiggle_ms = int(tokens[2])
+            n = _maybe_int(tokens[2]) if len(tokens) > 2 else None
+            if n is not None:
+                obj.wiggle_ms = n
 
         return obj
 
@@ -321,7 +375,7 @@ class KeyMapConfig:
     @classmethod
     def from_ini(cls, cfg, log=None):
         maps: list[BindingMap] = []
-        if cfg.cfg.has_option("input", "key_mappings"):
+        if cfg.has_option("input", "key_mappings"):
             lines = cfg.get_list("input", "key_mappings")
             for line in lines:
                 for entry in line.split("\\"):
@@ -351,7 +405,7 @@ class AxisMapConfig:
     @classmethod
     def from_ini(cls, cfg, log=None):
         maps: list[BindingMap] = []
-        if cfg.cfg.has_option("input", "axis_mappings"):
+        if cfg.has_option("input", "axis_mappings"):
             lines = cfg.get_list("input", "axis_mappings")
             for line in lines:
                 for entry in line.split("\\"):
@@ -10,43 +10,92 @@ Adds proper modifier-layer routing AND a global inhibit for base buttons:
     * Modified-layer bindings are ignored.
     * Base-layer bindings behave normally.
 
-Axis mappings are unchanged (only base **buttons** are inhibited).
+The same gating applies to axis mappings. Bindings are split into a base
+and a modifier list once, so each poll walks only the active layer.
 """
 import logging
+import math
+import threading
+import time
 
 import pygame
 from dataclasses import dataclass
 from typing import Optional, Tuple, Dict
 
-
-@dataclass
+# SDL joystick events drained in event-driven mode
+JOY_EVENTS = [
+    pygame.JOYAXISMOTION, pygame.JOYHATMOTION,
+    pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP,
+    pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED,
+]
+# events that carry an axis/button change we can bind to
+JOY_INPUT_EVENTS = {
+    pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP,
+}
+# hot-plug: the device list and binding plan are rebuilt on these
+JOY_DEVICE_EVENTS = {pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED}
+
+
+@dataclass(slots=True)
 class InputEvent:
     binding: object   # BindingMap
     pressed: bool     # True for press/active, False for release/inactive
     value: float = 0.0
 
 
+def coalesce_events(events):
+    """
+    Collapse continuous-axis events for the same binding into one event.
+    Digital events keep their order; each axis keeps only its latest value.
+    """
+    out = []
+    axes: Dict[int, InputEvent] = {}
+    for ev in events:
+        ib = ev.binding.input
+        if ib.input_type != "axis" or ib.axis_mode:
+            out.append(ev)
+            continue
+        axes[id(ev.binding)] = ev
+    out.extend(axes.values())
+    return out
+
+
 class InputDetector:
+    """
+    SDL thread affinity: the detector initialises pygame and sets its event
+    filter in __init__, and poll() pumps/waits on the SDL queue, so it must
+    be created on the thread that polls it (main.py's input-poll thread).
+    """
+
     def __init__(self, log, input_cfg, bindings):
         self.log = log
+        # thread that initialised SDL; the only one allowed to pump it
+        self._sdl_thread = threading.get_ident()
         self.input_cfg = input_cfg
         self.bindings = bindings
         self.state_cache: Dict[Tuple, bool] = {}
+        self._axis_last: Dict[Tuple, float] = {}  # last reported continuous-axis value
+        # Event-driven: wait for SDL joystick events and only re-read devices
+        # that reported something. Poll mode re-reads every binding each frame.
+        self.event_driven = input_cfg.input_mode == "event"
+        # SDL event pumping is capped at pump_hz; pumping faster only burns CPU
+        self._last_pump = 0.0
+        self._pump_interval = 1.0 / max(1, input_cfg.pump_hz)
+        self._rescan = True  # first poll reads every binding to pick up initial state
+        self._devices_changed = False  # set by a JOYDEVICEADDED/REMOVED event
         self._last_mod_on: Optional[bool] = None
+        # Resolved joystick per binding input (id(ib) -> Joystick|None)
+        self._resolved: Dict[int, object] = {}
 
         pygame.init()
         pygame.joystick.init()
+        # Only joystick events are queued (both modes): nothing else can fill
+        # the SDL queue and crowd out input, and only they wake event mode
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(JOY_EVENTS)
 
         # list devices
-        self.devices = []
-        for i in range(pygame.joystick.get_count()):
-            js = pygame.joystick.Joystick(i)
-            js.init()
-            try:
-                guid = js.get_guid()
-            except AttributeError:
-                guid = f"index-{i}"
-            self.devices.append((i, js, guid))
+        self.devices = self._scan_devices()
 
         # Verify bindings point at something we actually have (best-effort)
         for bm in self.bindings:
@@ -65,36 +114,151 @@ class InputDetector:
                     f"guid={ib.device_guid} index={ib.device_index} ({bm})"
                 )
 
-        # Build quick index so we can prefer MOD vs BASE for the same physical input
-        self._index = self._build_index(self.bindings)
+        self._rebuild_plan()
+
+    # ------------------------------------------------------------------
+    # Devices: enumerated at startup and again only on hot-plug events
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _scan_devices():
+        """(index, joystick, guid) for every attached device."""
+        devices = []
+        for i in range(pygame.joystick.get_count()):
+            js = pygame.joystick.Joystick(i)
+            js.init()
+            try:
+                guid = js.get_guid()
+            except AttributeError:
+                guid = f"index-{i}"
+            devices.append((i, js, guid))
+        return devices
+
+    def _rebuild_plan(self):
+        """Resolve every binding against self.devices and rebuild the poll plan."""
+        # Resolve devices once so poll() never scans by GUID/index per frame
+        self._resolved.clear()
+        self._instance_ids = {id(js): js.get_instance_id() for _, js, _ in self.devices}
+        self._modifier = self._compile_modifier()
+        self._plan = self._build_plan(self.bindings)
+
+        # Split by layer so poll() walks exactly one list per frame
+        self._base_plan, self._mod_plan = self._split_layers(self._plan)
+        self._base_by_input = self._group_by_input(self._base_plan)
+        self._mod_by_input = self._group_by_input(self._mod_plan)
+
+    def _reload_devices(self):
+        """
+        Re-enumerate after a hot-plug event and rebuild the plan. Returns
+        release events for bindings whose device went away, so nothing
+        stays held on a stick that is no longer there.
+        """
+        old_plan, old_ids = self._plan, self._instance_ids
+        self.devices = self._scan_devices()
+        self._rebuild_plan()
+        self.log.info(f"[DEVICE] Device list changed: {len(self.devices)} attached")
+
+        releases = []
+        for old, new in zip(old_plan, self._plan):
+            if not old[9]:
+                continue
+            if new[9] and old_ids.get(id(old[1])) == self._instance_ids.get(id(new[1])):
+                continue  # same physical device still backs this binding
+            bm, key = old[0], old[8]
+            if old[2] == "axis" and not old[4]:
+                if self._axis_last.pop(key, 0.0):
+                    releases.append(InputEvent(bm, False, value=0.0))
+            elif self.state_cache.pop(key, False):
+                releases.append(InputEvent(bm, False, value=0.0))
+        return releases
 
     # ------------------------------------------------------------------
-    # Index: for each physical input key → {'base': bm|None, 'mod': bm|None}
+    # Layers: base (no :M) vs modifier (:M) plan records
     # ------------------------------------------------------------------
     @staticmethod
-    def _key_for_binding(ib) -> Tuple[Optional[str], Optional[int], str, int]:
-        return (ib.device_guid, ib.device_index, ib.input_type, ib.input_id)
+    def _split_layers(plan):
+        base = [rec for rec in plan if not rec[7]]
+        mod = [rec for rec in plan if rec[7]]
+        return base, mod
 
-    def _build_index(self, maps):
-        idx: Dict[Tuple, Dict[str, object]] = {}
+    @staticmethod
+    def _group_by_input(plan):
+        """(SDL instance id, input_type, input_id) → valid plan records on that input."""
+        by_input: Dict[Tuple, list] = {}
+        for rec in plan:
+            if rec[9]:
+                key = (rec[1].get_instance_id(), rec[2], rec[3])
+                by_input.setdefault(key, []).append(rec)
+        return by_input
+
+    # ------------------------------------------------------------------
+    # Plan: one flat record per binding, precomputed for poll()
+    #   (bm, js, input_type, input_id, axis_mode, lo, hi,
+    #    modifier_layer, cache_key, is_valid)
+    # Axis-as-button is pressed while val < lo or val > hi (see _axis_bounds).
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _axis_bounds(mode, thr):
+        """(lo, hi) such that an axis-as-button is pressed iff val < lo or val > hi."""
+        if mode == "pos":
+            return -math.inf, thr
+        if mode == "neg":
+            return -thr, math.inf
+        if mode == "abs":
+            return -thr, thr
+        return -math.inf, math.inf  # unknown mode never presses
+
+    def _build_plan(self, maps):
+        plan = []
+        counts: Dict[int, Tuple[int, int]] = {}  # id(js) -> (buttons, axes)
         for bm in maps:
             ib = bm.input
-            key = self._key_for_binding(ib)
-            slot = idx.get(key)
-            if slot is None:
-                slot = {'base': None, 'mod': None}
-                idx[key] = slot
-            if ib.modifier_layer:
-                slot['mod'] = bm
-            else:
-                slot['base'] = bm
-        return idx
+            js = self._resolve_device(ib)
+
+            valid = js is not None
+            if valid:
+                num = counts.get(id(js))
+                if num is None:
+                    num = (js.get_numbuttons(), js.get_numaxes())
+                    counts[id(js)] = num
+                limit = num[0] if ib.input_type == "button" else num[1]
+                if ib.input_id < 0 or ib.input_id >= limit:
+                    valid = False
+                    if self.input_cfg.debug_inputs:
+                        self.log.warning(
+                            f"[DETECTOR] Invalid {ib.input_type} index {ib.input_id} "
+                            f"for device {ib.device_index} (has {limit}) binding={bm}"
+                        )
+
+            key = (
+                ib.device_index,
+                ib.device_guid,
+                ib.input_type,
+                ib.input_id,
+                ib.axis_mode,
+                ib.threshold,
+                ib.modifier_layer
+            )
+            lo, hi = self._axis_bounds(ib.axis_mode, ib.threshold or 0.5)
+            plan.append((
+                bm, js, ib.input_type, ib.input_id, ib.axis_mode,
+                lo, hi, ib.modifier_layer, key, valid,
+            ))
+        return plan
 
     # ------------------------------------------------------------------
     # Resolve pygame joystick for a given binding input
     # ------------------------------------------------------------------
     def _resolve_device(self, ib):
-        """Return pygame joystick for given binding input."""
+        """Return pygame joystick for given binding input (cached after first lookup)."""
+        key = id(ib)
+        if key in self._resolved:
+            return self._resolved[key]
+        js = self._lookup_device(ib)
+        self._resolved[key] = js
+        return js
+
+    def _lookup_device(self, ib):
+        """Scan attached devices for the given binding input."""
         for idx, js, guid in self.devices:
             if ib.device_index is not None and ib.device_index == idx:
                 return js
@@ -105,47 +269,108 @@ class InputDetector:
     # ------------------------------------------------------------------
     # Global modifier state
     # ------------------------------------------------------------------
-    def _modifier_active(self) -> bool:
-        """Evaluate the global modifier (button or axis)."""
+    def _compile_modifier(self):
+        """(js, input_type, input_id, lo, hi) for the global modifier, or None if unusable."""
         ib = getattr(self.input_cfg, "modifier", None)
         if not ib:
-            return False
+            return None
 
         js = self._resolve_device(ib)
         if not js:
-            return False
+            return None
 
         try:
             if ib.input_type == "button":
-                num = js.get_numbuttons()
-                if ib.input_id < 0 or ib.input_id >= num:
-                    return False
-                return js.get_button(ib.input_id) == 1
-
-            if ib.input_type == "axis":
-                num = js.get_numaxes()
-                if ib.input_id < 0 or ib.input_id >= num:
-                    return False
-                val = js.get_axis(ib.input_id)
-                thr = ib.threshold if (ib.threshold is not None) else 0.5
-                mode = ib.axis_mode or "abs"
-                if mode == "pos":
-                    return val > thr
-                if mode == "neg":
-                    return val < -thr
-                return abs(val) > thr  # "abs"
+                limit = js.get_numbuttons()
+            elif ib.input_type == "axis":
+                limit = js.get_numaxes()
+            else:
+                return None
         except Exception:
-            return False
+            return None
+        if ib.input_id < 0 or ib.input_id >= limit:
+            return None
+
+        thr = ib.threshold if (ib.threshold is not None) else 0.5
+        lo, hi = self._axis_bounds(ib.axis_mode or "abs", thr)
+        return js, ib.input_type, ib.input_id, lo, hi
 
-        return False
+    def _modifier_active(self) -> bool:
+        """Evaluate the global modifier (button or axis)."""
+        mod = self._modifier
+        if mod is None:
+            return False
+        js, itype, iid, lo, hi = mod
+        try:
+            if itype == "button":
+                return js.get_button(iid) == 1
+            val = js.get_axis(iid)
+            return val < lo or val > hi
+        except Exception:
+            return False
 
     # ------------------------------------------------------------------
     # Poll
     # ------------------------------------------------------------------
-    def poll(self):
-        """Poll all bindings, return list of InputEvents."""
-        pygame.event.pump()
+    def _drain_events(self, timeout: float):
+        """
+        Wait up to `timeout` seconds for joystick activity, then drain the
+        whole SDL queue in one go. Returns {(instance_id, type, id): latest}
+        so a burst of queued motion collapses to one entry per input.
+        """
+        evs = []
+        if timeout > 0 and not pygame.event.peek(JOY_EVENTS):
+            first = pygame.event.wait(int(timeout * 1000))
+            if first.type in JOY_INPUT_EVENTS or first.type in JOY_DEVICE_EVENTS:
+                evs.append(first)
+        evs.extend(pygame.event.get(JOY_EVENTS))
+
+        latest: Dict[Tuple, object] = {}
+        for ev in evs:
+            t = ev.type
+            if t == pygame.JOYAXISMOTION:
+                latest[(ev.instance_id, "axis", ev.axis)] = ev.value
+            elif t == pygame.JOYBUTTONDOWN:
+                latest[(ev.instance_id, "button", ev.button)] = True
+            elif t == pygame.JOYBUTTONUP:
+                latest[(ev.instance_id, "button", ev.button)] = False
+            elif t in JOY_DEVICE_EVENTS:
+                self._devices_changed = True
+        return latest
+
+    def poll(self, timeout: float = 0.0):
+        """
+        Poll bindings, return list of InputEvents.
+        In event-driven mode this blocks up to `timeout` seconds while the
+        sticks are idle and only evaluates inputs that produced events.
+        In poll mode the whole layer is read, but only after a pump that
+        brought in joystick input.
+        """
+        if threading.get_ident() != self._sdl_thread:
+            raise RuntimeError("InputDetector.poll() called off the thread that created it")
+        touched = None  # None → evaluate the whole active layer
+        if self.event_driven:
+            touched = self._drain_events(timeout)
+        else:
+            touched = {}  # nothing new since the last pump → nothing to read
+            now = time.monotonic()
+            if now - self._last_pump >= self._pump_interval:
+                # get() pumps too; it takes everything queued so the SDL
+                # queue can never fill up, non-joystick events are ignored
+                pumped = pygame.event.get()
+                self._last_pump = now
+                if any(ev.type in JOY_INPUT_EVENTS for ev in pumped):
+                    touched = None
+                if any(ev.type in JOY_DEVICE_EVENTS for ev in pumped):
+                    self._devices_changed = True
         events = []
+        if self._devices_changed:
+            self._devices_changed = False
+            events.extend(self._reload_devices())
+            self._rescan = True
+        if self._rescan:
+            self._rescan = False
+            touched = None
 
         # Check modifier once per poll
         mod_on = self._modifier_active()
@@ -158,91 +383,68 @@ class InputDetector:
             level = logging.INFO if self.input_cfg.debug_inputs else logging.DEBUG
             self.log.log(level, "[MOD] M -> %s", "ON" if mod_on else "OFF")
 
-        for bm in self.bindings:
-            ib = bm.input
-
-            # --------- LAYER GATING ----------
-            # If this is a modified-layer binding, ignore unless modifier is on.
-            if ib.modifier_layer and not mod_on:
-                continue
-
-            # GLOBAL INHIBIT (requested): when modifier is ON, ignore ALL base-layer BUTTONs
-            # GLOBAL INHIBIT (buttons + axes): when modifier is ON, ignore ALL base-layer bindings
-            if (not ib.modifier_layer) and mod_on:
-                continue
-
-            # Previous priority rule (kept for axes): if modifier ON and a :M exists for same input,
-            # let :M handle it instead of base.
-            if (not ib.modifier_layer) and mod_on and ib.input_type != "button":
-                slot = self._index.get(self._key_for_binding(ib))
-                if slot and slot.get('mod') is not None:
-                    continue
-
-            js = self._resolve_device(ib)
-            if not js:
+            # Axes of the layer going inactive stop reporting: settle them at zero
+            inactive = self._base_plan if mod_on else self._mod_plan
+            for bm, js, itype, iid, amode, lo, hi, mod_layer, key, valid in inactive:
+                if itype == "axis" and not amode and self._axis_last.pop(key, 0.0):
+                    events.append(InputEvent(bm, False, value=0.0))
+
+            # the newly active layer may already be held: read all of it
+            touched = None
+
+        # --------- LAYER GATING ----------
+        # Modifier ON  → only :M bindings (ALL base bindings globally inhibited)
+        # Modifier OFF → only base bindings
+        if mod_on:
+            active, by_input = self._mod_plan, self._mod_by_input
+        else:
+            active, by_input = self._base_plan, self._base_by_input
+
+        # Event-driven: only bindings on inputs that reported a change, at
+        # most once per input, using the value the event carried. A full
+        # scan (startup, layer switch, poll mode) reads the devices instead.
+        if touched is not None:
+            if not touched:
+                return events
+            work = [(rec, raw) for k, raw in touched.items() for rec in by_input.get(k, ())]
+        else:
+            work = [(rec, None) for rec in active]
+
+        get_state = self.state_cache.get
+        axis_last = self._axis_last
+        deadzone = self.input_cfg.axis_deadzone
+        epsilon = self.input_cfg.axis_report_epsilon
+        for rec, raw in work:
+            bm, js, itype, iid, amode, lo, hi, mod_layer, key, valid = rec
+            # device missing or index out of range (checked once in _build_plan)
+            if not valid:
                 continue
 
             # ---------------- BUTTON ----------------
-            if ib.input_type == "button":
-                num = js.get_numbuttons()
-                if ib.input_id < 0 or ib.input_id >= num:
-                    if self.input_cfg.debug_inputs:
-                        self.log.warning(
-                            f"[DETECTOR] Invalid button index {ib.input_id} "
-                            f"for device {ib.device_index} (has {num}) binding={bm}"
-                        )
-                    continue
-                state = js.get_button(ib.input_id) == 1
+            if itype == "button":
+                state = js.get_button(iid) == 1 if raw is None else raw
 
             # ---------------- AXIS-AS-BUTTON ----------------
-            elif ib.input_type == "axis" and ib.axis_mode:
-                num = js.get_numaxes()
-                if ib.input_id < 0 or ib.input_id >= num:
-                    if self.input_cfg.debug_inputs:
-                        self.log.warning(
-                            f"[DETECTOR] Invalid axis index {ib.input_id} "
-                            f"for device {ib.device_index} (has {num}) binding={bm}"
-                        )
-                    continue
-                val = js.get_axis(ib.input_id)
-                state = False
-                if ib.axis_mode == "pos":
-                    state = val > (ib.threshold or 0.5)
-                elif ib.axis_mode == "neg":
-                    state = val < -(ib.threshold or 0.5)
-                elif ib.axis_mode == "abs":
-                    state = abs(val) > (ib.threshold or 0.5)
+            elif amode:
+                val = js.get_axis(iid) if raw is None else raw
+                state = val < lo or val > hi
 
             # ---------------- AXIS (continuous) ----------------
-            elif ib.input_type == "axis" and not ib.axis_mode:
-                num = js.get_numaxes()
-                if ib.input_id < 0 or ib.input_id >= num:
-                    if self.input_cfg.debug_inputs:
-                        self.log.warning(
-                            f"[DETECTOR] Invalid axis index {ib.input_id} "
-                            f"for device {ib.device_index} (has {num}) binding={bm}"
-                        )
+            else:
+                # Continuous axis: report only real changes. Values inside the
+                # deadzone collapse to 0.0 so entering it is reported exactly once.
+                val = js.get_axis(iid) if raw is None else raw
+                if abs(val) < deadzone:
+                    val = 0.0
+                prev = axis_last.get(key)
+                if prev is not None and abs(val - prev) < epsilon:
                     continue
-                val = js.get_axis(ib.input_id)
-                # Continuous axis: emit every frame (already layer-gated above)
+                axis_last[key] = val
                 events.append(InputEvent(bm, True, value=val))
                 continue
 
-            else:
-                continue
-
             # ---------------- DIGITAL EDGE EMIT ----------------
-            key = (
-                ib.device_index,
-                ib.device_guid,
-                ib.input_type,
-                ib.input_id,
-                ib.axis_mode,
-                ib.threshold,
-                ib.modifier_layer
-            )
-            prev = self.state_cache.get(key, False)
-            if state != prev:
+            if state != get_state(key, False):
                 events.append(InputEvent(bm, state, value=1.0 if state else 0.0))
                 self.state_cache[key] = state
 
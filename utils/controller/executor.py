@@ -9,13 +9,46 @@ executor.py - Executes actions for input events. Supports:
 - focusing windows
 - wiggle toggle
 - mouse increment (MouseInc/MouseDec) with acceleration
+
+Rate-driven effects (wheel, increment, wiggle, toggled key repeat) run as
+asyncio tasks on the main loop: each one sleeps until its next tick and is
+cancelled on release, so nothing runs while nothing is held. Single taps
+and clicks hold their key/button in a task too, never blocking the loop.
 """
 
+import asyncio
 import ctypes
 import time
 from ctypes import wintypes as wt
+from dataclasses import dataclass
+
+from utils.timer.waitabletimer import begin_timer_resolution, end_timer_resolution
+
+# prototypes declared once so ctypes does no per-call argument inference;
+# errors are read with ctypes.get_last_error() on failure only
+user32 = ctypes.WinDLL("user32", use_last_error=True)
+user32.GetCursorPos.argtypes = [ctypes.POINTER(wt.POINT)]
+user32.GetCursorPos.restype = wt.BOOL
+user32.ShowWindow.argtypes = [wt.HWND, ctypes.c_int]
+user32.ShowWindow.restype = wt.BOOL
+user32.SetForegroundWindow.argtypes = [wt.HWND]
+user32.SetForegroundWindow.restype = wt.BOOL
+user32.keybd_event.argtypes = [wt.BYTE, wt.BYTE, wt.DWORD, ctypes.c_size_t]
+user32.keybd_event.restype = None
+
+ACCUM_BITS = 10                 # axis sub-pixel accumulators are fixed point, 1/1024 px
+AXIS_MAX_DT_NS = 100_000_000    # integrate at most 100 ms after a stall
+KEY_REPEAT_NS = 50_000_000      # toggled keys re-tap every 50 ms
+KEY_TAP_S = 0.03                # hold time of a single or repeated tap
 
-user32 = ctypes.windll.user32
+
+@dataclass(slots=True)
+class HoldState:
+    """A held wheel/increment output and when its next tick is due."""
+    out: object             # OutputAction; timing comes precompiled in out.ramp
+    start_ns: int
+    last_ns: int
+    next_ns: int
 
 
 class InputExecutor:
@@ -24,247 +57,422 @@ class InputExecutor:
         self.keymapper = keymapper
         self.mousecontroller = mousecontroller
         self.input_cfg = input_cfg
-
-        # axis accumulators
-        self.axis_accum = {}
+        # per-category log sinks, None while that logging is off; bound
+        # once so the hot paths skip both the config check and the f-string
+        self._log_button = None
+        self._log_axis = None
+        self._log_input = None
+        self._bind_loggers()
+
+        # axis state: key → [deflection, fixed-point sub-pixel remainder, 0=x/1=y];
+        # deflection is reported on change only, integrated once per frame in update()
+        self.axis_values = {}
         self._abs_pos = None
+        self._last_axis_update = time.monotonic_ns()
 
-        # wheel hold state
-        self.wheel_state = {}
+        # one POINT reused for every cursor query
+        self._pt = wt.POINT()
+        self._pt_ref = ctypes.byref(self._pt)
+        self._GetCursorPos = user32.GetCursorPos
 
         # wiggle state
         self.wiggle_active = input_cfg.wiggle_initially_on
-        self.last_wiggle = 0
+        self.last_wiggle = 0        # monotonic ns of the last nudge
+        self._wiggle_tick = 0       # nudges so far; odd ticks go the other way
         self.wiggle_px = input_cfg.wiggle_px
         self.wiggle_ms = input_cfg.wiggle_ms
         self.wiggle_mode = "relative"
         if self.wiggle_active and self.log:
             self.log.info(f"[WIGGLE] initially ON (px={self.wiggle_px}, ms={self.wiggle_ms})")
 
-        self.wiggle_mode = "relative"
-
-        # increment state (per-binding)
-        self.increment_state = {}
+        # toggled keys: key_id → on/off
         self.key_toggle_state = {}
-        self.key_toggle_repeat = {}   # tracks repeat timing for toggled keys
+
+        # one asyncio task per running timed effect, each owning its
+        # HoldState; nothing iterates these per frame. Keys are
+        # ("wheel", ...) / ("inc", ...) / ("toggle", ...), built once per
+        # binding in compile_binding, or ("wiggle",)
+        self._tasks = {}
+        self._timer_res = False       # holding a timeBeginPeriod(1) reference
+
     # ---------------------------------------------------------------
     # Event handling
     # ---------------------------------------------------------------
     def handle_event(self, event):
-        ib = event.binding.input
-        for out in event.binding.outputs:
-            if out.type == "key":
-                self._exec_key(out, event)
-
-            elif out.type == "mouse_button":
-                self._exec_button(out, event)
-
-            elif out.type == "mouse_wheel":
-                if event.pressed:
-                    self._start_wheel_hold(ib, out)
-                else:
-                    self._stop_wheel_hold(ib, out)
-
-            elif out.type == "mouse_axis":
-                self._exec_axis(out, event)
-
-            elif out.type == "mouse_center" and event.pressed:
-                self._exec_center(out)
+        handlers = event.binding.handlers
+        if handlers is None:
+            handlers = self.compile_binding(event.binding)
+        for h in handlers[bool(event.pressed)]:
+            h(event)
+
+    def set_debug(self, on: bool):
+        """Switch debug_inputs logging at runtime."""
+        self.input_cfg.debug_inputs = on
+        self._bind_loggers()
+
+    def _bind_loggers(self):
+        cfg = self.input_cfg
+        info = self.log.info
+        self._log_button = info if cfg.debug_inputs or cfg.log_buttons else None
+        self._log_axis = info if cfg.debug_inputs or cfg.log_axes else None
+        self._log_input = info if cfg.debug_inputs else None
 
-            elif out.type == "focus_window" and event.pressed:
-                self._exec_focus(out)
-
-            elif out.type == "mouse_wiggle" and event.pressed:
-                self._toggle_wiggle(out)
-
-            elif out.type == "mouse_increment":
-                if event.pressed:
-                    self._start_increment(ib, out)
-                else:
-                    self._stop_increment(ib, out)
+    # ---------------------------------------------------------------
+    # Binding compilation
+    # ---------------------------------------------------------------
+    def compile_bindings(self, bindings):
+        """Specialize every binding's outputs into event handlers, once at load."""
+        for bm in bindings:
+            self.compile_binding(bm)
+
+    def compile_binding(self, bm):
+        """Set bm.handlers = (on_release, on_press), tuples of handler(event)."""
+        on_release, on_press = [], []
+        for out in bm.outputs:
+            press, release = self._compile_output(bm.input, out)
+            if press is not None:
+                on_press.append(press)
+            if release is not None:
+                on_release.append(release)
+        bm.handlers = (tuple(on_release), tuple(on_press))
+        return bm.handlers
+
+    def _compile_output(self, ib, out):
+        """(on_press, on_release) for one output; None where it ignores that edge."""
+        t = out.type
+        if t == "key":
+            return self._compile_key(ib, out)
+        if t == "mouse_button":
+            return self._compile_button(ib, out)
+        if t == "mouse_axis":
+            return self._compile_axis(ib, out)
+        if t == "mouse_wheel":
+            key = self._wheel_key(ib, out)
+            return (lambda e: self._start_wheel_hold(key, out),
+                    lambda e: self._stop_wheel_hold(key))
+        if t == "mouse_increment":
+            key = self._inc_key(ib, out)
+            return (lambda e: self._start_increment(key, out),
+                    lambda e: self._stop_increment(key))
+        if t == "mouse_center":
+            return (lambda e: self._exec_center(out)), None
+        if t == "focus_window":
+            return (lambda e: self._exec_focus(out)), None
+        if t == "mouse_wiggle":
+            return (lambda e: self._toggle_wiggle(out)), None
+        return None, None
+
+    def busy(self) -> bool:
+        """True while axis motion needs per-frame updates on the main loop."""
+        return bool(self.axis_values)
 
     def update(self):
-        """Update continuous effects once per frame"""
-        self._update_wheels()
-        self._update_wiggle()
-        self._update_increments()
-        self._update_key_toggles()
+        """Integrate axis motion once per frame (timed effects run as tasks)"""
+        self._update_axes()
+        # one SendInput for every button/wheel/motion event of this frame
+        self.mousecontroller.flush()
 
     # ---------------------------------------------------------------
-    # Keys / Buttons
+    # Timed effect tasks
     # ---------------------------------------------------------------
-    def _exec_key(self, out, event):
-        if out.mode == "single":
-            if event.pressed:
-                if self.input_cfg.debug_inputs or self.input_cfg.log_buttons:
-                    self.log.info(f"[KEY] {out.value} TAP")
-                self.keymapper.tap(out.value)
-
-        elif out.mode == "hold":
-            if event.pressed:
-                if self.input_cfg.debug_inputs or self.input_cfg.log_buttons:
-                    self.log.info(f"[KEY] {out.value} DOWN")
-                self.keymapper.key_down(out.value)
-            else:
-                if self.input_cfg.debug_inputs or self.input_cfg.log_buttons:
-                    self.log.info(f"[KEY] {out.value} UP")
-                self.keymapper.key_up(out.value)
-        elif out.mode == "toggle":
-            if event.pressed:
-                key_id = (
-                    out.type,
-                    out.value,
-                    event.binding.input.device_guid,
-                    event.binding.input.input_id,
-                )
-                state = self.key_toggle_state.get(key_id, False)
-                if state:
-                    # turn OFF
-                    self.keymapper.key_up(out.value)
-                    self.key_toggle_state[key_id] = False
-                    self.key_toggle_repeat.pop(key_id, None)
-                    if self.input_cfg.debug_inputs or self.input_cfg.log_buttons:
-                        self.log.info(f"[KEY] {out.value} TOGGLE OFF")
-                else:
-                    # turn ON
-                    self.keymapper.key_down(out.value)  # optional: initial down
-                    self.key_toggle_state[key_id] = True
-                    self.key_toggle_repeat[key_id] = time.time()
-                    if self.input_cfg.debug_inputs or self.input_cfg.log_buttons:
-                        self.log.info(f"[KEY] {out.value} TOGGLE ON")
+    def start(self):
+        """Begin executing; call from inside the running asyncio loop."""
+        # 1 ms scheduler granularity for the tasks' sleeps (reference
+        # counted by Windows, so harmless if the caller already asked for it)
+        if not self._timer_res:
+            self._timer_res = begin_timer_resolution(1)
+        if self.wiggle_active:
+            self._spawn(("wiggle",), self._wiggle_loop())
+
+    def stop(self):
+        """Cancel every running timed effect."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        if self._timer_res:
+            end_timer_resolution(1)
+            self._timer_res = False
+
+    def _spawn(self, key, coro):
+        """Run `coro` as the task for `key`, replacing any previous one."""
+        self._cancel(key)
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks[key] = task
+        task.add_done_callback(lambda t, k=key: self._task_done(k, t))
+
+    def _cancel(self, key) -> bool:
+        """Cancel the task for `key`; True if one was running."""
+        task = self._tasks.pop(key, None)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def _task_done(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.log.error(f"[TASK] {key[0]} effect failed", exc_info=task.exception())
 
+    # ---------------------------------------------------------------
+    # Keys / Buttons
+    # ---------------------------------------------------------------
+    def _compile_key(self, ib, out):
+        km = self.keymapper
+        combo = out.value
 
-    def _exec_button(self, out, event):
+        if out.mode == "single":
+            # the hold runs as a task so the loop keeps going meanwhile
+            key_id = ("tap", combo, ib.device_guid, ib.input_id)
+
+            def press(event):
+                log = self._log_button
+                if log is not None:
+                    log(f"[KEY] {combo} TAP")
+                self._spawn(key_id, self._tap_loop(combo))
+            return press, None
+
+        if out.mode == "hold":
+            def press(event):
+                log = self._log_button
+                if log is not None:
+                    log(f"[KEY] {combo} DOWN")
+                km.key_down(combo)
+
+            def release(event):
+                log = self._log_button
+                if log is not None:
+                    log(f"[KEY] {combo} UP")
+                km.key_up(combo)
+            return press, release
+
+        if out.mode == "toggle":
+            key_id = ("toggle", combo, ib.device_guid, ib.input_id)
+            return (lambda event: self._toggle_key(key_id, combo)), None
+
+        return None, None
+
+    def _toggle_key(self, key_id, combo):
+        if self.key_toggle_state.get(key_id, False):
+            # turn OFF
+            self.key_toggle_state[key_id] = False
+            self._cancel(key_id)
+            self.keymapper.key_up(combo)
+            if self._log_button is not None:
+                self._log_button(f"[KEY] {combo} TOGGLE OFF")
+        else:
+            # turn ON
+            self.keymapper.key_down(combo)  # optional: initial down
+            self.key_toggle_state[key_id] = True
+            self._spawn(key_id, self._key_repeat_loop(combo))
+            if self._log_button is not None:
+                self._log_button(f"[KEY] {combo} TOGGLE ON")
+
+    async def _key_repeat_loop(self, combo):
+        """Re-tap a toggled key every KEY_REPEAT_NS until cancelled."""
+        next_ns = time.monotonic_ns()
+        while True:
+            # fixed cadence; after a stall resume from now instead of bursting
+            next_ns = max(next_ns + KEY_REPEAT_NS, time.monotonic_ns())
+            await self._sleep_until(next_ns)
+            self.keymapper.key_down(combo)
+            try:
+                await asyncio.sleep(KEY_TAP_S)
+            finally:
+                self.keymapper.key_up(combo)  # also on cancel mid-tap
+
+    async def _tap_loop(self, combo):
+        """Tap a combo once: down, hold KEY_TAP_S, up (also on cancel mid-tap)."""
+        self.keymapper.key_down(combo)
+        try:
+            await asyncio.sleep(KEY_TAP_S)
+        finally:
+            self.keymapper.key_up(combo)
+
+    def _compile_button(self, ib, out):
+        mc = self.mousecontroller
+        button = out.value
         hold_ms = 30
         if out.extra and "hold_ms" in out.extra:
             hold_ms = out.extra["hold_ms"]
 
         if out.mode == "single":
-            if event.pressed:
-                if self.input_cfg.debug_inputs or self.input_cfg.log_buttons:
-                    self.log.info(f"[BUTTON] Mouse {out.value} CLICK ({hold_ms} ms)")
-                self.mousecontroller.click(out.value, hold_ms=hold_ms)
-
-        elif out.mode == "hold":
-            if event.pressed:
-                if self.input_cfg.debug_inputs or self.input_cfg.log_buttons:
-                    self.log.info(f"[BUTTON] Mouse {out.value} DOWN")
-                self.mousecontroller.button_down(out.value)
-            else:
-                if self.input_cfg.debug_inputs or self.input_cfg.log_buttons:
-                    self.log.info(f"[BUTTON] Mouse {out.value} UP")
-                self.mousecontroller.button_up(out.value)
+            key_id = ("click", button, ib.device_guid, ib.input_id)
+
+            def press(event):
+                log = self._log_button
+                if log is not None:
+                    log(f"[BUTTON] Mouse {button} CLICK ({hold_ms} ms)")
+                if hold_ms > 0:
+                    # held clicks run as a task so the loop keeps going meanwhile
+                    self._spawn(key_id, self._click_loop(button, hold_ms / 1000.0))
+                else:
+                    mc.click(button, hold_ms=0)  # DOWN+UP in one SendInput, no wait
+            return press, None
+
+        if out.mode == "hold":
+            def press(event):
+                log = self._log_button
+                if log is not None:
+                    log(f"[BUTTON] Mouse {button} DOWN")
+                mc.button_down(button)
+
+            def release(event):
+                log = self._log_button
+                if log is not None:
+                    log(f"[BUTTON] Mouse {button} UP")
+                mc.button_up(button)
+            return press, release
+
+        return None, None
+
+    async def _click_loop(self, button, hold_s):
+        """Click a mouse button: down, hold `hold_s`, up (also on cancel mid-click)."""
+        mc = self.mousecontroller
+        mc.button_down(button)
+        mc.flush()
+        try:
+            await asyncio.sleep(hold_s)
+        finally:
+            mc.button_up(button)
+            mc.flush()
 
     # ---------------------------------------------------------------
     # Wheel hold-to-scroll
     # ---------------------------------------------------------------
     def _wheel_key(self, ib, out):
-        return (ib.device_index, ib.device_guid, ib.input_type, ib.input_id, out.value)
-
-    def _start_wheel_hold(self, ib, out):
-        now = time.time()
-        self.wheel_state[self._wheel_key(ib, out)] = {"start": now, "last": now, "out": out}
-        if self.input_cfg.debug_inputs:
-            self.log.info(f"[INPUT] wheel {out.value} START")
+        """Task key of a wheel binding (also its state key)."""
+        return ("wheel", ib.device_index, ib.device_guid, ib.input_type, ib.input_id, out.value)
+
+    @staticmethod
+    def _new_hold(out, now):
+        return HoldState(out, now, now, now + 1_000_000_000 // out.ramp.init)
+
+    @staticmethod
+    def _ramp_ticks(hold, now):
+        """Ticks due at `now` for a ramping hold; advances last_ns/next_ns. Returns (ticks, rate)."""
+        p = hold.out.ramp
+        last = hold.last_ns
+
+        # closed form in integers: rate in millihertz, interval in ns;
+        # past the ramp the interval is the one precomputed at load
+        elapsed_ns = now - hold.start_ns
+        if elapsed_ns >= p.ramp_ns:
+            rate_mhz = p.vmax * 1000
+            interval = p.vmax_interval_ns
+        else:
+            rate_mhz = p.init * 1000 + (p.vmax - p.init) * 1000 * elapsed_ns // p.ramp_ns
+            interval = max(1, 1_000_000_000_000 // rate_mhz)  # ns per tick
+        ticks = (now - last) // interval
+        if ticks:
+            last += ticks * interval
+            hold.last_ns = last
+        # one interval at the current rate; while ramping up the real
+        # interval only shrinks, so the next wake always has a tick due
+        hold.next_ns = last + interval
+        return ticks, rate_mhz / 1000
+
+    @staticmethod
+    async def _sleep_until(ns):
+        delay = ns - time.monotonic_ns()
+        await asyncio.sleep(delay / 1e9 if delay > 0 else 0)
+
+    def _start_wheel_hold(self, key, out):
+        hold = self._new_hold(out, time.monotonic_ns())
+        self._spawn(key, self._wheel_loop(hold))
+        if self._log_input is not None:
+            self._log_input(f"[INPUT] wheel {out.value} START")
         self.mousecontroller.wheel(out.value)
 
-    def _stop_wheel_hold(self, ib, out):
-        key = self._wheel_key(ib, out)
-        if key in self.wheel_state:
-            if self.input_cfg.debug_inputs:
-                self.log.info(f"[INPUT] wheel {key[-1]} STOP")
-            del self.wheel_state[key]
-
-    def _update_key_toggles(self):
-        if not self.key_toggle_repeat:
-            return
-        now = time.time()
-        for key_id in list(self.key_toggle_repeat.keys()):
-            out_value = key_id[1]  # the actual key string
-            last_time = self.key_toggle_repeat[key_id]
-            if now - last_time >= 0.05:  # repeat every 50 ms
-                self.keymapper.tap(out_value)  # send down+up
-                self.key_toggle_repeat[key_id] = now
-
-    def _update_wheels(self):
-        if not self.wheel_state:
-            return
-        now = time.time()
-        for key, state in list(self.wheel_state.items()):
-            out = state["out"]
-            init = max(1, int(out.wheel_init or 5))
-            vmax = max(init, int(out.wheel_max or 30))
-            ramp_ms = max(1, int(out.wheel_accel or 1000))
-
-            start = state["start"]
-            last = state["last"]
-
-            elapsed_ms = (now - start) * 1000.0
-            if elapsed_ms >= ramp_ms:
-                rate = float(vmax)
-            else:
-                rate = init + (vmax - init) * (elapsed_ms / ramp_ms)
-
-            interval = 1.0 / max(1e-6, rate)
-            while now - last >= interval:
-                self.mousecontroller.wheel(out.value)
-                last += interval
-                if self.input_cfg.debug_inputs:
-                    self.log.info(f"[INPUT] wheel {out.value} TICK (rate={rate:.1f}/s)")
-            state["last"] = last
+    def _stop_wheel_hold(self, key):
+        if self._cancel(key) and self._log_input is not None:
+            self._log_input(f"[INPUT] wheel {key[-1]} STOP")
+
+    async def _wheel_loop(self, hold):
+        """Send wheel notches for a held binding, accelerating along its ramp."""
+        out = hold.out
+        wheel = self.mousecontroller.wheel
+        while True:
+            await self._sleep_until(hold.next_ns)
+            ticks, rate = self._ramp_ticks(hold, time.monotonic_ns())
+            if ticks:
+                # all notches due at this wake go out in one call
+                wheel(out.value, count=ticks)
+                self.mousecontroller.flush()
+                if self._log_input is not None:
+                    self._log_input(f"[INPUT] wheel {out.value} TICK x{ticks} (rate={rate:.1f}/s)")
 
     # ---------------------------------------------------------------
     # Axis handling
     # ---------------------------------------------------------------
-    def _exec_axis(self, out, event):
-        dev_idx   = event.binding.input.device_index
-        guid      = event.binding.input.device_guid
-        axis_id   = event.binding.input.input_id
-        axis_name = out.value  # "x" or "y"
-        key = (dev_idx, guid, axis_id, axis_name)
-
-        value = event.value
-        if abs(value) < self.input_cfg.axis_deadzone:
-            value = 0.0
+    def _compile_axis(self, ib, out):
+        key = (ib.device_index, ib.device_guid, ib.input_id, out.value)  # out.value: "x"/"y"
+        h = lambda event: self._exec_axis(key, event.value)
+        return h, h
+
+    def _exec_axis(self, key, value):
+        """Record the new deflection of an axis (detector reports changes only)."""
+        if value == 0.0 or abs(value) < self.input_cfg.axis_deadzone:
+            # back to rest: stop moving and drop any sub-pixel remainder
+            self.axis_values.pop(key, None)
             return
+        if not self.axis_values:
+            # leaving idle: integrate from now, not from the last idle tick
+            self._last_axis_update = time.monotonic_ns()
+        st = self.axis_values.get(key)
+        if st is None:
+            self.axis_values[key] = [value, 0, 0 if key[3] == "x" else 1]
+        else:
+            st[0] = value
 
-        velocity = value * self.input_cfg.axis_speed
-        dt = 1.0 / max(1, self.input_cfg.axis_poll_hz)
-
-        delta = velocity * dt
-        accum = self.axis_accum.get(key, 0.0) + delta
-        step = int(accum)
-        self.axis_accum[key] = accum - step
+    def _update_axes(self):
+        now = time.monotonic_ns()
+        dt_ns = min(now - self._last_axis_update, AXIS_MAX_DT_NS)  # clamp after stalls
+        self._last_axis_update = now
+        if not self.axis_values:
+            return
 
-        if step != 0:
-            if self.input_cfg.axis_mode == "relative":
-                if axis_name == "x":
-                    self.mousecontroller.move_relative(step, 0)
-                else:
-                    self.mousecontroller.move_relative(0, step)
-            else:  # absolute
-                if self._abs_pos is None:
-                    pt = wt.POINT()
-                    ctypes.windll.user32.GetCursorPos(ctypes.byref(pt))
-                    self._abs_pos = [pt.x, pt.y]
-
-                if axis_name == "x":
-                    self._abs_pos[0] += step
-                else:
-                    self._abs_pos[1] += step
+        speed = self.input_cfg.axis_speed
+        relative = self.input_cfg.axis_mode == "relative"
+        log_axis = self._log_axis
+        scale = (dt_ns << ACCUM_BITS) / 1_000_000_000
+        delta = [0, 0]  # this frame's (dx, dy), sent as one motion
+        for key, st in self.axis_values.items():
+            value = st[0]
+            velocity = value * speed
+
+            # whole pixels out, remainder kept; shift the magnitude so
+            # both directions truncate toward zero the same way
+            accum = st[1] + int(velocity * scale)
+            if accum >= 0:
+                step = accum >> ACCUM_BITS
+            else:
+                step = -((-accum) >> ACCUM_BITS)
+            st[1] = accum - (step << ACCUM_BITS)
+            delta[st[2]] += step
 
-                x0 = user32.GetSystemMetrics(76)  # SM_XVIRTUALSCREEN
-                y0 = user32.GetSystemMetrics(77)
-                w  = user32.GetSystemMetrics(78)
-                h  = user32.GetSystemMetrics(79)
-                self._abs_pos[0] = max(x0, min(x0 + w - 1, self._abs_pos[0]))
-                self._abs_pos[1] = max(y0, min(y0 + h - 1, self._abs_pos[1]))
-                self.mousecontroller.set_position_pixels(self._abs_pos[0], self._abs_pos[1])
+            if log_axis is not None:
+                log_axis(
+                    f"[AXIS] {key[3].upper()} val={value:.3f} vel={velocity:.1f} step={step}"
+                )
 
-        if self.input_cfg.debug_inputs or self.input_cfg.log_axes:
-            self.log.info(
-                f"[AXIS] {axis_name.upper()} val={value:.3f} vel={velocity:.1f} step={step}"
-            )
+        dx, dy = delta
+        if not (dx or dy):
+            return
+        if relative:
+            self.mousecontroller.move_relative(dx, dy)
+        else:  # absolute: _abs_pos is canonical, the cursor is read only once
+            if self._abs_pos is None:
+                self._abs_pos = list(self._cursor_pos())
+            x0, y0, w, h = self.mousecontroller.virtual_screen()
+            self._abs_pos[0] = max(x0, min(x0 + w - 1, self._abs_pos[0] + dx))
+            self._abs_pos[1] = max(y0, min(y0 + h - 1, self._abs_pos[1] + dy))
+            self.mousecontroller.move_absolute(self._abs_pos[0], self._abs_pos[1])
+
+    def _cursor_pos(self):
+        """Current cursor position as (x, y), read into the shared POINT."""
+        self._GetCursorPos(self._pt_ref)
+        return self._pt.x, self._pt.y
 
     # ---------------------------------------------------------------
     # CenterMouse
@@ -331,7 +539,10 @@ class InputExecutor:
             if not user32.SetForegroundWindow(hwnd):
                 user32.keybd_event(0x12, 0, 0, 0)   # ALT down
                 user32.keybd_event(0x12, 0, 2, 0)   # ALT up
-                user32.SetForegroundWindow(hwnd)
+                if not user32.SetForegroundWindow(hwnd):
+                    self.log.warning(
+                        f"[FOCUS] SetForegroundWindow failed, err={ctypes.get_last_error()}"
+                    )
 
     # ---------------------------------------------------------------
     # Wiggle
@@ -342,76 +553,67 @@ class InputExecutor:
             self.wiggle_mode = out.extra.get("wiggle_mode", "relative")
             self.wiggle_px = out.extra.get("wiggle_px", 5)
             self.wiggle_ms = out.extra.get("wiggle_ms", 1000)
-        if self.input_cfg.debug_inputs:
-            self.log.info(f"[WIGGLE] {'ON' if self.wiggle_active else 'OFF'}")
-
-
-    def _update_wiggle(self):
-        if not self.wiggle_active:
-            return
-        now = time.time() * 1000.0
-        if now - self.last_wiggle >= self.wiggle_ms:
-            dx = self.wiggle_px if int(now/self.wiggle_ms) % 2 == 0 else -self.wiggle_px
-            if self.wiggle_mode == "relative":
-                self.mousecontroller.move_relative(dx, 0)
-            else:
-                pt = wt.POINT()
-                user32.GetCursorPos(ctypes.byref(pt))
-                self.mousecontroller.set_position_pixels(pt.x + dx, pt.y)
-            self.last_wiggle = now
+        if self.wiggle_active:
+            self._spawn(("wiggle",), self._wiggle_loop())
+        else:
+            self._cancel(("wiggle",))
+        if self._log_input is not None:
+            self._log_input(f"[WIGGLE] {'ON' if self.wiggle_active else 'OFF'}")
+
+    async def _wiggle_loop(self):
+        """Nudge the cursor back and forth every wiggle_ms while wiggle is on."""
+        while True:
+            now = time.monotonic_ns()
+            period = max(1, int(self.wiggle_ms)) * 1_000_000
+            if now - self.last_wiggle >= period:
+                # alternate direction on every nudge
+                dx = -self.wiggle_px if self._wiggle_tick & 1 else self.wiggle_px
+                self._wiggle_tick += 1
+                if self.wiggle_mode == "relative":
+                    self.mousecontroller.move_relative(dx, 0)
+                    self.mousecontroller.flush()
+                else:
+                    x, y = self._cursor_pos()
+                    self.mousecontroller.set_position_pixels(x + dx, y)
+                self.last_wiggle = now
+            await self._sleep_until(self.last_wiggle + period)
 
     # ---------------------------------------------------------------
     # MouseInc / MouseDec
     # ---------------------------------------------------------------
     def _inc_key(self, ib, out):
-        return (ib.device_index, ib.device_guid, ib.input_id, out.value)
-
-    def _start_increment(self, ib, out):
-        now = time.time()
-        self.increment_state[self._inc_key(ib, out)] = {
-            "start": now, "last": now, "out": out
-        }
-
-    def _stop_increment(self, ib, out):
-        key = self._inc_key(ib, out)
-        if key in self.increment_state:
-            del self.increment_state[key]
-
-    def _update_increments(self):
-        if not self.increment_state:
-            return
-        now = time.time()
-        for key, state in list(self.increment_state.items()):
-            out = state["out"]
-            init = max(1, int(out.wheel_init or 5))
-            vmax = max(init, int(out.wheel_max or 30))
-            ramp_ms = max(1, int(out.wheel_accel or 1000))
-
-            start = state["start"]
-            last = state["last"]
-
-            elapsed_ms = (now - start) * 1000.0
-            if elapsed_ms >= ramp_ms:
-                rate = float(vmax)
+        """Task key of a MouseInc/MouseDec binding."""
+        return ("inc", ib.device_index, ib.device_guid, ib.input_id, out.value)
+
+    def _start_increment(self, key, out):
+        hold = self._new_hold(out, time.monotonic_ns())
+        self._spawn(key, self._increment_loop(hold))
+
+    def _stop_increment(self, key):
+        self._cancel(key)
+
+    async def _increment_loop(self, hold):
+        """Step the cursor for a held MouseInc/MouseDec, accelerating along its ramp."""
+        p = hold.out.ramp
+        move_relative = self.mousecontroller.move_relative
+        flush = self.mousecontroller.flush
+        set_position = self.mousecontroller.set_position_pixels
+        while True:
+            await self._sleep_until(hold.next_ns)
+            ticks, _ = self._ramp_ticks(hold, time.monotonic_ns())
+            if not ticks:
+                continue
+            # all steps due at this wake fused into one move
+            amount = p.amount * ticks
+            if p.mode == "relative":
+                if p.axis == "x":
+                    move_relative(amount, 0)
+                else:
+                    move_relative(0, amount)
+                flush()
             else:
-                rate = init + (vmax - init) * (elapsed_ms / ramp_ms)
-
-            interval = 1.0 / max(1e-6, rate)
-            while now - last >= interval:
-                axis = out.extra.get("axis", "x")
-                amount = out.extra.get("amount", 1)
-                mode = out.extra.get("mode", "relative")
-                if mode == "relative":
-                    if axis == "x":
-                        self.mousecontroller.move_relative(amount, 0)
-                    else:
-                        self.mousecontroller.move_relative(0, amount)
+                x, y = self._cursor_pos()
+                if p.axis == "x":
+                    set_position(x + amount, y)
                 else:
-                    pt = wt.POINT()
-                    user32.GetCursorPos(ctypes.byref(pt))
-                    if axis == "x":
-                        self.mousecontroller.set_position_pixels(pt.x + amount, pt.y)
-                    else:
-                        self.mousecontroller.set_position_pixels(pt.x, pt.y + amount)
-                last += interval
-            state["last"] = last
+                    set_position(x, y + amount)
@@ -5,16 +5,40 @@ Utility for handling game controllers (joysticks, throttles, pedals).
 Uses pygame for cross-platform input.
 """
 
+import time
+
 import pygame
 
+DEVICE_CACHE_S = 2.0  # list_devices() re-enumerates at most this often
+
+
+def _init_pygame():
+    """Initialize pygame's joystick subsystem once per process."""
+    if not pygame.joystick.get_init():
+        pygame.init()
+        pygame.joystick.init()
+
+
 class GameController:
+    """
+    Thin wrapper around a pygame Joystick.
+
+    list_devices() is cached; call invalidate_devices() on
+    JOYDEVICEADDED/JOYDEVICEREMOVED to force a re-enumeration.
+
+    The get_* readers do not pump SDL themselves: call GameController.pump()
+    once per frame before reading, not once per axis/button.
+    """
+
+    _devices_cache = None
+    _devices_ts = 0.0
+
     def __init__(self, guid: str = None, index: int = None):
         """
         Create a controller instance by GUID or index.
         GUID preferred (stable across reboots).
         """
-        pygame.init()
-        pygame.joystick.init()
+        _init_pygame()
 
         if guid is not None:
             # Try to find joystick with matching GUID
@@ -34,19 +58,37 @@ class GameController:
         else:
             raise ValueError("Must provide either GUID or index")
 
-    @staticmethod
-    def list_devices():
+    @classmethod
+    def list_devices(cls):
         """
         Return list of all connected devices with (index, guid, name).
         """
-        pygame.init()
-        pygame.joystick.init()
+        now = time.monotonic()
+        if cls._devices_cache is not None and now - cls._devices_ts < DEVICE_CACHE_S:
+            return list(cls._devices_cache)
+        _init_pygame()
         devices = []
         for i in range(pygame.joystick.get_count()):
             js = pygame.joystick.Joystick(i)
             devices.append((i, js.get_guid(), js.get_name()))
+        cls._devices_cache = tuple(devices)
+        cls._devices_ts = now
         return devices
 
+    @classmethod
+    def invalidate_devices(cls):
+        """
+        Drop the cached device list (call on device add/remove).
+        """
+        cls._devices_cache = None
+
+    @staticmethod
+    def pump():
+        """
+        Refresh joystick state for all controllers. Call once per frame.
+        """
+        pygame.event.pump()
+
     def get_guid(self) -> str:
         return self.joystick.get_guid()
 
@@ -57,19 +99,16 @@ class GameController:
         """
         Return axis value in range [-1.0, 1.0].
         """
-        pygame.event.pump()
         return self.joystick.get_axis(axis)
 
     def get_button(self, button: int) -> bool:
         """
         Return True if button is pressed.
         """
-        pygame.event.pump()
         return bool(self.joystick.get_button(button))
 
     def get_hat(self, hat: int = 0) -> tuple[float, float]:
         """
         Return hat state as (x, y).
         """
-        pygame.event.pump()
         return self.joystick.get_hat(hat)
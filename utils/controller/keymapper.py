@@ -6,13 +6,34 @@ Supports combos like: "A", "F1", "Ctrl+Shift+F5", "Alt+Tab"
 
 import ctypes
 import ctypes.wintypes as wt
+import logging
 import time
+from functools import lru_cache
 
 user32 = ctypes.WinDLL("user32", use_last_error=True)
 
 # --- constants ---
 INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
 KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_SCANCODE = 0x0008
+MAPVK_VK_TO_VSC = 0
+
+# keys that live on the extended (E0-prefixed) half of the keyboard
+EXTENDED_VKS = frozenset({
+    0x21, 0x22, 0x23, 0x24,     # PGUP, PGDN, END, HOME
+    0x25, 0x26, 0x27, 0x28,     # arrows
+    0x2D, 0x2E,                 # INS, DEL
+    0x5B, 0x5C,                 # LWIN, RWIN
+    0xA3, 0xA5,                 # RCTRL, RALT
+})
+
+# prototypes declared once; SendInput is bound to a module name for the send path
+user32.MapVirtualKeyW.argtypes = [wt.UINT, wt.UINT]
+user32.MapVirtualKeyW.restype = wt.UINT
+user32.SendInput.argtypes = [wt.UINT, ctypes.c_void_p, ctypes.c_int]
+user32.SendInput.restype = wt.UINT
+_SendInput = user32.SendInput
 
 # pick correct ULONG_PTR
 if ctypes.sizeof(ctypes.c_void_p) == 8:
@@ -60,8 +81,11 @@ class INPUT(ctypes.Structure):
         ("u", _INPUTUNION),
     ]
 
+SIZEOF_INPUT = ctypes.sizeof(INPUT)
+
 
 # --- Helpers for mapping strings to VK codes ---
+@lru_cache(maxsize=None)
 def _vk_from_str(key: str) -> int:
     """Map a string like 'A', 'F1', 'Ctrl' to a Windows virtual-key code."""
     k = key.upper()
@@ -115,10 +139,24 @@ def _vk_from_str(key: str) -> int:
     return mapping.get(k, 0)
 
 
+@lru_cache(maxsize=None)
+def _key_from_vk(vk: int) -> tuple[int, int, int]:
+    """(vk, scan code, flags) for a VK; scan-code input when Windows knows the code."""
+    sc = user32.MapVirtualKeyW(vk, MAPVK_VK_TO_VSC)
+    if not sc:
+        return vk, 0, 0
+    flags = KEYEVENTF_SCANCODE
+    if vk in EXTENDED_VKS:
+        flags |= KEYEVENTF_EXTENDEDKEY
+    return vk, sc, flags
+
+
 # --- Main class ---
 class KeyMapper:
     def __init__(self, log=None):
         self.log = log
+        # combo string → (vk, scan, flags) per key, () for combos that failed to parse
+        self._combos: dict[str, tuple[tuple[int, int, int], ...]] = {}
 
     def tap(self, combo: str, hold_ms: int = 30):
         """Press + release a combo with optional hold time (default 30 ms)."""
@@ -126,51 +164,68 @@ class KeyMapper:
         time.sleep(hold_ms / 1000.0)
         self.key_up(combo)
 
+    def _parse_combo(self, combo: str) -> tuple[tuple[int, int, int], ...]:
+        """Keys of a combo like 'Ctrl+Shift+F5' as (vk, scan, flags), parsed once per combo string."""
+        keys = self._combos.get(combo)
+        if keys is None:
+            parts = [p.strip() for p in combo.split("+") if p.strip()]
+            vks = tuple(_vk_from_str(p) for p in parts)
+            keys = () if 0 in vks else tuple(_key_from_vk(vk) for vk in vks)
+            self._combos[combo] = keys
+        if not keys and self.log:
+            self.log.warning(f"[KEYMAPPER] Unknown key combo: {combo}")
+        return keys
+
     def key_down(self, combo: str):
         """Press a combo and keep it held (until key_up)."""
-        parts = [p.strip() for p in combo.split("+") if p.strip()]
-        vks = [_vk_from_str(p) for p in parts]
-        if not vks or any(vk == 0 for vk in vks):
-            if self.log:
-                self.log.warning(f"[KEYMAPPER] Unknown key combo: {combo}")
+        keys = self._parse_combo(combo)
+        if not keys:
             return
 
-        # press all in order
-        for vk in vks:
-            self._send_vk(vk, down=True)
+        # press all in order, one SendInput for the whole combo
+        self._send_keys(keys, down=True)
 
         if self.log:
-            self.log.debug(f"[KEYMAPPER] DOWN combo: {combo}")
+            self.log.debug("[KEYMAPPER] DOWN combo: %s", combo)
 
     def key_up(self, combo: str):
         """Release a combo that was held with key_down()."""
-        parts = [p.strip() for p in combo.split("+") if p.strip()]
-        vks = [_vk_from_str(p) for p in parts]
-        if not vks or any(vk == 0 for vk in vks):
-            if self.log:
-                self.log.warning(f"[KEYMAPPER] Unknown key combo: {combo}")
+        keys = self._parse_combo(combo)
+        if not keys:
             return
 
-        # release all in reverse order
-        for vk in reversed(vks):
-            self._send_vk(vk, down=False)
+        # release all in reverse order, one SendInput for the whole combo
+        self._send_keys(keys[::-1], down=False)
 
         if self.log:
-            self.log.debug(f"[KEYMAPPER] UP combo: {combo}")
+            self.log.debug("[KEYMAPPER] UP combo: %s", combo)
 
     def send_key(self, combo: str):
         """Legacy: tap a key combo immediately (for compatibility)."""
         self.tap(combo, hold_ms=30)
 
-    def _send_vk(self, vk: int, down=True):
-        flags = 0 if down else KEYEVENTF_KEYUP
-        ki = KEYBDINPUT(wVk=vk, wScan=0, dwFlags=flags, time=0, dwExtraInfo=0)
-        inp = INPUT(type=INPUT_KEYBOARD, ki=ki)
-        n = user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
-        if n == 0:
+    def _send_keys(self, keys, down=True):
+        """Send key events for several keys atomically with a single SendInput.
+
+        Keys with a scan code go out as KEYEVENTF_SCANCODE input (seen by
+        DirectInput/RawInput games), the rest by VK.
+        """
+        up = 0 if down else KEYEVENTF_KEYUP
+        n = len(keys)
+        arr = (INPUT * n)()
+        for i, (vk, sc, flags) in enumerate(keys):
+            arr[i].type = INPUT_KEYBOARD
+            if sc:
+                arr[i].ki = KEYBDINPUT(wVk=0, wScan=sc, dwFlags=flags | up, time=0, dwExtraInfo=0)
+            else:
+                arr[i].ki = KEYBDINPUT(wVk=vk, wScan=0, dwFlags=up, time=0, dwExtraInfo=0)
+        sent = _SendInput(n, ctypes.byref(arr), SIZEOF_INPUT)
+        if sent != n:
             err = ctypes.get_last_error()
             if self.log:
-                self.log.error(f"[KEYMAPPER] SendInput failed, err={err}")
-        else:
-            if self.log:
-                self.log.debug(f"[KEYMAPPER] {'DOWN' if down else 'UP'} vk=0x{vk:02X}")
+                self.log.error(f"[KEYMAPPER] SendInput sent {sent}/{n}, err={err}")
+        elif self.log and self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug(
+                f"[KEYMAPPER] {'DOWN' if down else 'UP'} "
+                + " ".join(f"vk=0x{k[0]:02X}" for k in keys)
+            )
@@ -7,9 +7,41 @@ Windows-only. Supports VR by sending relative deltas via SendInput.
 
 import ctypes
 import ctypes.wintypes as wt
+import time
+from contextlib import contextmanager
 import win32api
 
-user32 = ctypes.windll.user32
+# private handle: these prototypes must not leak onto the shared ctypes.windll.user32
+user32 = ctypes.WinDLL("user32", use_last_error=True)
+user32.GetSystemMetrics.argtypes = [ctypes.c_int]
+user32.GetSystemMetrics.restype = ctypes.c_int
+user32.SendInput.argtypes = [wt.UINT, ctypes.c_void_p, ctypes.c_int]
+user32.SendInput.restype = wt.UINT
+user32.FindWindowW.argtypes = [wt.LPCWSTR, wt.LPCWSTR]
+user32.FindWindowW.restype = wt.HWND  # full pointer width, not a truncated int
+user32.GetWindowRect.argtypes = [wt.HWND, ctypes.c_void_p]
+user32.GetWindowRect.restype = wt.BOOL
+user32.GetMonitorInfoW.argtypes = [wt.HMONITOR, ctypes.c_void_p]
+user32.GetMonitorInfoW.restype = wt.BOOL
+# callbacks are passed as plain pointers so any WINFUNCTYPE flavour fits
+user32.EnumDisplayMonitors.argtypes = [wt.HDC, ctypes.c_void_p, ctypes.c_void_p, wt.LPARAM]
+user32.EnumDisplayMonitors.restype = wt.BOOL
+user32.EnumWindows.argtypes = [ctypes.c_void_p, wt.LPARAM]
+user32.EnumWindows.restype = wt.BOOL
+user32.IsWindowVisible.argtypes = [wt.HWND]
+user32.IsWindowVisible.restype = wt.BOOL
+user32.IsWindow.argtypes = [wt.HWND]
+user32.IsWindow.restype = wt.BOOL
+user32.GetWindowTextLengthW.argtypes = [wt.HWND]
+user32.GetWindowTextLengthW.restype = ctypes.c_int
+user32.GetWindowTextW.argtypes = [wt.HWND, wt.LPWSTR, ctypes.c_int]
+user32.GetWindowTextW.restype = ctypes.c_int
+user32.GetClassNameW.argtypes = [wt.HWND, wt.LPWSTR, ctypes.c_int]
+user32.GetClassNameW.restype = ctypes.c_int
+user32.SetProcessDPIAware.argtypes = []
+user32.SetProcessDPIAware.restype = wt.BOOL
+# cursor placement goes through pywin32's C wrapper rather than ctypes marshalling
+_SetCursorPos = win32api.SetCursorPos
 
 # --- Constants for input ---
 MOUSEEVENTF_MOVE = 0x0001
@@ -22,8 +54,21 @@ MOUSEEVENTF_RIGHTDOWN  = 0x0008
 MOUSEEVENTF_RIGHTUP    = 0x0010
 MOUSEEVENTF_MIDDLEDOWN = 0x0020
 MOUSEEVENTF_MIDDLEUP   = 0x0040
+MOUSEEVENTF_XDOWN      = 0x0080
+MOUSEEVENTF_XUP        = 0x0100
 MOUSEEVENTF_WHEEL      = 0x0800
 MOUSEEVENTF_HWHEEL     = 0x01000
+XBUTTON1 = 0x0001
+XBUTTON2 = 0x0002
+
+# button name → (down flag, up flag, mouseData), looked up once per press
+_BUTTON_FLAGS = {
+    "MB1": (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP, 0),
+    "MB2": (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP, 0),
+    "MB3": (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP, 0),
+    "MB4": (MOUSEEVENTF_XDOWN, MOUSEEVENTF_XUP, XBUTTON1),
+    "MB5": (MOUSEEVENTF_XDOWN, MOUSEEVENTF_XUP, XBUTTON2),
+}
 
 INPUT_MOUSE = 0
 DWORD = ctypes.wintypes.DWORD
@@ -55,6 +100,55 @@ class RECT(ctypes.Structure):
         ("bottom", ctypes.c_long),
     ]
 
+MonitorEnumProc = ctypes.WINFUNCTYPE(
+    ctypes.c_int, ctypes.wintypes.HMONITOR,
+    ctypes.wintypes.HDC, ctypes.POINTER(RECT),
+    ctypes.wintypes.LPARAM
+)
+
+# EnumDisplayMonitors target: one callback object for the process, filling
+# _enumerated with (hmon, (x0, y0, w, h)) in virtual-desktop pixels
+_enumerated = []
+
+def _collect_monitor(hmon, hdc, lprect, lparam):
+    r = lprect.contents
+    _enumerated.append((hmon, (r.left, r.top, r.right - r.left, r.bottom - r.top)))
+    return True
+
+_enum_monitors_proc = MonitorEnumProc(_collect_monitor)
+
+WNDENUMPROC = ctypes.WINFUNCTYPE(wt.BOOL, wt.HWND, wt.LPARAM)
+
+# EnumWindows target, likewise created once: fills _windows_found with
+# (hwnd, class_name, title) of visible top-level windows, reading through
+# two reused buffers (titles longer than 511 chars are truncated)
+_windows_found = []
+_title_buf = ctypes.create_unicode_buffer(512)
+_class_buf = ctypes.create_unicode_buffer(256)
+
+def _collect_window(hwnd, lParam):
+    if not user32.IsWindowVisible(hwnd):
+        return True
+    user32.GetWindowTextW(hwnd, _title_buf, 512)
+    user32.GetClassNameW(hwnd, _class_buf, 256)
+    _windows_found.append((hwnd, _class_buf.value, _title_buf.value))
+    return True
+
+_enum_windows_proc = WNDENUMPROC(_collect_window)
+
+_dpi_aware = False
+
+def _ensure_dpi_aware():
+    """Make the process DPI aware once, before any rect or cursor math."""
+    global _dpi_aware
+    if _dpi_aware:
+        return
+    _dpi_aware = True
+    try:
+        user32.SetProcessDPIAware()
+    except Exception:
+        pass
+
 class MONITORINFOEX(ctypes.Structure):
     _fields_ = [
         ("cbSize", ctypes.wintypes.DWORD),
@@ -67,71 +161,138 @@ class MONITORINFOEX(ctypes.Structure):
 
 # --- Mouse Controller ---
 class MouseController:
+    # monitors as [(hmon, (x0, y0, w, h))], shared by all instances
+    _monitors = None
+    _monitors_ts = 0.0
+
     def __init__(self, log=None):
         self.log = log
+        # Button/wheel/relative-motion events queued during a frame, sent by
+        # flush(); whoever moves the cursor calls flush() once per tick
+        self._pending: list[MOUSEINPUT] = []
+        # >0 inside batch(): flush() and absolute moves wait for the outermost end_batch()
+        self._batch_depth = 0
+        # Virtual desktop rect (x0, y0, w, h), refreshed lazily by virtual_screen()
+        self._vscreen = None
+        self._vscreen_ts = 0.0
+        # (title, class_name) → last HWND found, revalidated with IsWindow
+        self._hwnd_cache: dict[tuple, int] = {}
+        # INPUT array reused by flush(), grown on demand; type set once per slot
+        self._batch = self._new_batch(8)
+        # one INPUT reused for immediate (absolute) cursor motion
+        self._move_input = INPUT(type=INPUT_MOUSE)
+        self._move_mi = self._move_input.mi
+        self._move_ref = ctypes.byref(self._move_input)
+        _ensure_dpi_aware()
+
+    # --- Frame batching ---
+    def _queue(self, flags: int, data: int = 0):
+        """Queue one button/wheel event for the next flush()."""
+        self._pending.append(MOUSEINPUT(0, 0, data, flags, 0, None))
+
+    def begin_batch(self):
+        """Hold back flush() until the matching end_batch() (calls nest)."""
+        self._batch_depth += 1
+
+    def end_batch(self):
+        """Close a batch; the outermost one sends everything queued in it."""
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self._send_pending()
+
+    @contextmanager
+    def batch(self):
+        """
+        `with mouse.batch():` collects all events of the block into one SendInput
+        (a set_position_* placement sends what was queued before it first).
+        """
+        self.begin_batch()
         try:
-            user32.SetProcessDPIAware()
-        except Exception:
-            pass
-
-    # existing set_position_pixels, set_position_frac, etc.
+            yield self
+        finally:
+            self.end_batch()
+
+    def flush(self):
+        """Send all queued button/wheel/motion events with a single SendInput call
+        (deferred to end_batch() while a batch is open)."""
+        if not self._batch_depth:
+            self._send_pending()
+
+    def _send_pending(self):
+        pending = self._pending
+        n = len(pending)
+        if not n:
+            return
+        self._pending = []
+        arr = self._batch
+        if len(arr) < n:
+            arr = self._batch = self._new_batch(max(n, 2 * len(arr)))
+        for i, mi in enumerate(pending):
+            arr[i].mi = mi
+        user32.SendInput(n, ctypes.byref(arr), ctypes.sizeof(INPUT))
 
     @staticmethod
-    def get_monitor_handle(index: int):
-        """Return handle to the monitor by index (0-based)."""
-        monitors = []
+    def _new_batch(size: int):
+        arr = (INPUT * size)()
+        for i in range(size):
+            arr[i].type = INPUT_MOUSE
+        return arr
 
-        def callback(hmon, hdc, lprect, lparam):
-            monitors.append(hmon)
-            return True
+    # existing set_position_pixels, set_position_frac, etc.
 
-        MonitorEnumProc = ctypes.WINFUNCTYPE(
-            ctypes.c_int, ctypes.wintypes.HMONITOR,
-            ctypes.wintypes.HDC, ctypes.POINTER(RECT),
-            ctypes.wintypes.LPARAM
-        )
-        user32.EnumDisplayMonitors(0, 0, MonitorEnumProc(callback), 0)
+    @classmethod
+    def monitors(cls, max_age: float = 1.0):
+        """Monitors as [(hmon, (x0, y0, w, h))], re-enumerated at most once per `max_age` seconds."""
+        now = time.monotonic()
+        if cls._monitors is None or now - cls._monitors_ts > max_age:
+            _enumerated.clear()
+            user32.EnumDisplayMonitors(0, 0, _enum_monitors_proc, 0)
+            cls._monitors = list(_enumerated)
+            cls._monitors_ts = now
+        return cls._monitors
+
+    @classmethod
+    def invalidate_monitors(cls):
+        """Forget the cached monitor list (e.g. after a display change)."""
+        cls._monitors = None
+
+    @classmethod
+    def get_monitor_handle(cls, index: int):
+        """Return handle to the monitor by index (0-based)."""
+        monitors = cls.monitors()
+        if 0 <= index < len(monitors):
+            return monitors[index][0]
+        return None
 
+    @classmethod
+    def get_monitor_rect(cls, index: int):
+        """Return (x0, y0, w, h) of the monitor by index (0-based), or None."""
+        monitors = cls.monitors()
+        if not 0 <= index < len(monitors):
+            # maybe attached since the last enumeration: look once more
+            monitors = cls.monitors(max_age=0.0)
         if 0 <= index < len(monitors):
-            return monitors[index]
+            return monitors[index][1]
         return None
 
     def button_down(self, button: str):
-        mapping = {
-            "MB1": 0x0002,  # LEFTDOWN
-            "MB2": 0x0008,  # RIGHTDOWN
-            "MB3": 0x0020,  # MIDDLEDOWN
-            "MB4": 0x0080,  # XDOWN (XBUTTON1)
-            "MB5": 0x0100,  # XDOWN (XBUTTON2)
-        }
-        flag = mapping.get(button)
-        if not flag:
+        """Queue a button press (sent on flush())."""
+        flags = _BUTTON_FLAGS.get(button)
+        if flags is None:
             return
-        inp = INPUT()
-        inp.type = INPUT_MOUSE
-        inp.mi = MOUSEINPUT(0, 0, 0, flag, 0, None)
-        user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        self._queue(flags[0], flags[2])
 
     def button_up(self, button: str):
-        mapping = {
-            "MB1": 0x0004,  # LEFTUP
-            "MB2": 0x0010,  # RIGHTUP
-            "MB3": 0x0040,  # MIDDLEUP
-            "MB4": 0x0100,  # XUP (XBUTTON1)
-            "MB5": 0x0200,  # XUP (XBUTTON2)
-        }
-        flag = mapping.get(button)
-        if not flag:
+        """Queue a button release (sent on flush())."""
+        flags = _BUTTON_FLAGS.get(button)
+        if flags is None:
             return
-        inp = INPUT()
-        inp.type = INPUT_MOUSE
-        inp.mi = MOUSEINPUT(0, 0, 0, flag, 0, None)
-        user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        self._queue(flags[1], flags[2])
 
     def set_position_window_px(self, hwnd=None, title=None, class_name=None, x=0, y=0):
         """Move mouse to absolute pixel coordinates inside a specific window."""
         if hwnd is None:
-            hwnd = self.find_window(title=title, class_name=class_name)
+            hwnd = self._window_for(title, class_name)
         if not hwnd:
             return
         wx, wy, ww, wh = self.get_window_rect(hwnd)
@@ -141,58 +302,104 @@ class MouseController:
 
     def set_position_monitor_frac(self, monitor_index: int, fx: float, fy: float):
         """Move mouse to fraction of a specific monitor."""
-        hmon = self.get_monitor_handle(monitor_index)
-        if not hmon:
+        rect = self.get_monitor_rect(monitor_index)
+        if rect is None:
             return
-        mi = MONITORINFOEX()
-        mi.cbSize = ctypes.sizeof(MONITORINFOEX)
-        if user32.GetMonitorInfoW(hmon, ctypes.byref(mi)):
-            x0, y0 = mi.rcMonitor.left, mi.rcMonitor.top
-            w = mi.rcMonitor.right - x0
-            h = mi.rcMonitor.bottom - y0
-            abs_x = int(x0 + fx * w)
-            abs_y = int(y0 + fy * h)
-            self.set_position_pixels(abs_x, abs_y)
+        x0, y0, w, h = rect
+        abs_x = int(x0 + fx * w)
+        abs_y = int(y0 + fy * h)
+        self.set_position_pixels(abs_x, abs_y)
 
     def set_position_monitor_px(self, monitor_index: int, px: int, py: int):
         """Move mouse to absolute pixel offset inside a specific monitor."""
-        hmon = self.get_monitor_handle(monitor_index)
-        if not hmon:
+        rect = self.get_monitor_rect(monitor_index)
+        if rect is None:
             return
-        mi = MONITORINFOEX()
-        mi.cbSize = ctypes.sizeof(MONITORINFOEX)
-        if user32.GetMonitorInfoW(hmon, ctypes.byref(mi)):
-            x0, y0 = mi.rcMonitor.left, mi.rcMonitor.top
-            w = mi.rcMonitor.right - x0
-            h = mi.rcMonitor.bottom - y0
-            abs_x = int(x0 + min(max(px, 0), w - 1))
-            abs_y = int(y0 + min(max(py, 0), h - 1))
-            self.set_position_pixels(abs_x, abs_y)
+        x0, y0, w, h = rect
+        abs_x = int(x0 + min(max(px, 0), w - 1))
+        abs_y = int(y0 + min(max(py, 0), h - 1))
+        self.set_position_pixels(abs_x, abs_y)
 
 
     # --- Virtual desktop positioning ---
     def set_position_pixels(self, x: int, y: int):
         """Absolute move to desktop pixel coords."""
-        user32.SetCursorPos(x, y)
-        self.log.debug(f"[MOUSE] Set position pixels: ({x},{y})")
+        # SetCursorPos bypasses the SendInput queue: deliver what was queued
+        # before it first (also inside a batch), so e.g. a press stays ahead of the jump
+        self._send_pending()
+        try:
+            _SetCursorPos((x, y))
+        except win32api.error as e:
+            # e.g. secure desktop / locked workstation: skip this move
+            self.log.warning("[MOUSE] SetCursorPos(%d,%d) failed: %s", x, y, e)
+            return
+        self.log.debug("[MOUSE] Set position pixels: (%d,%d)", x, y)
+
+    def virtual_screen(self, max_age: float = 1.0):
+        """Virtual desktop rect (x0, y0, w, h), re-read at most once per `max_age` seconds."""
+        now = time.monotonic()
+        if self._vscreen is None or now - self._vscreen_ts > max_age:
+            SM = user32.GetSystemMetrics
+            # SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN
+            self._vscreen = (SM(76), SM(77), SM(78), SM(79))
+            self._vscreen_ts = now
+        return self._vscreen
+
+    def invalidate_virtual_screen(self):
+        """Forget the cached virtual desktop rect (e.g. after a display change)."""
+        self._vscreen = None
+
+    def move_absolute(self, x: int, y: int):
+        """Absolute move to desktop pixel coords through SendInput (like a real mouse)."""
+        x0, y0, w, h = self.virtual_screen()
+        # SendInput wants the virtual desktop normalized to 0..65535
+        nx = (x - x0) * 65535 // max(1, w - 1)
+        ny = (y - y0) * 65535 // max(1, h - 1)
+        flags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+        if self._batch_depth:
+            # keeps its place among the queued events (never merged with relative moves)
+            self._pending.append(MOUSEINPUT(nx, ny, 0, flags, 0, None))
+        else:
+            self._send_move(nx, ny, flags)
 
     def set_position_frac(self, fx: float, fy: float):
         """Absolute move to fraction [0..1] of virtual desktop."""
-        x = user32.GetSystemMetrics(76)  # SM_XVIRTUALSCREEN
-        y = user32.GetSystemMetrics(77)  # SM_YVIRTUALSCREEN
-        w = user32.GetSystemMetrics(78)  # SM_CXVIRTUALSCREEN
-        h = user32.GetSystemMetrics(79)  # SM_CYVIRTUALSCREEN
+        x, y, w, h = self.virtual_screen()
         abs_x = int(x + fx * w)
         abs_y = int(y + fy * h)
         self.set_position_pixels(abs_x, abs_y)
 
     # --- Relative movement (VR safe) ---
     def move_relative(self, dx: int, dy: int):
-        """Send relative mouse movement (like a real mouse)."""
-        inp = INPUT()
-        inp.type = INPUT_MOUSE
-        inp.mi = MOUSEINPUT(dx, dy, 0, MOUSEEVENTF_MOVE, 0, None)
-        user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        """
+        Queue relative mouse movement (like a real mouse), sent on flush().
+        Consecutive moves merge into one event; a button/wheel event in
+        between keeps its place, so ordering is preserved.
+        """
+        pending = self._pending
+        if pending and pending[-1].dwFlags == MOUSEEVENTF_MOVE:
+            mi = pending[-1]
+            mi.dx += dx
+            mi.dy += dy
+        else:
+            pending.append(MOUSEINPUT(dx, dy, 0, MOUSEEVENTF_MOVE, 0, None))
+
+    def _send_move(self, dx: int, dy: int, flags: int):
+        mi = self._move_mi
+        mi.dx = dx
+        mi.dy = dy
+        mi.dwFlags = flags
+        user32.SendInput(1, self._move_ref, ctypes.sizeof(INPUT))
+
+    def move_relative_batch(self, deltas):
+        """
+        Queue a sequence of relative (dx, dy) moves behind anything already
+        queued (they merge like move_relative()) and flush, so they go out in
+        one SendInput, or with the enclosing batch().
+        """
+        for dx, dy in deltas:
+            self.move_relative(dx, dy)
+        self.flush()
 
     # --- New helper: move along one axis ---
     def move_axis(self, axis: str, amount: int = 5):
@@ -202,7 +409,7 @@ class MouseController:
         elif axis.lower() == "y":
             self.move_relative(0, amount)
         else:
-            self.log.warning(f"[MOUSE] Unsupported move axis: {axis}")
+            self.log.warning("[MOUSE] Unsupported move axis: %s", axis)
 
     # --- Click buttons ---
     def click(self, button: str, hold_ms: int = 30):
@@ -212,52 +419,58 @@ class MouseController:
         hold_ms = how long to hold the button down before releasing (default 30 ms).
         """
         btn = button.upper()
-
-        if btn == "MB1":
-            down, up, data = MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP, 0
-        elif btn == "MB2":
-            down, up, data = MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP, 0
-        elif btn == "MB3":
-            down, up, data = MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP, 0
-        elif btn == "MB4":
-            down, up, data = 0x0800, 0x1000, 0x0001  # XDOWN/XUP + XBUTTON1
-        elif btn == "MB5":
-            down, up, data = 0x0800, 0x1000, 0x0002  # XDOWN/XUP + XBUTTON2
-        else:
+        flags = _BUTTON_FLAGS.get(btn)
+        if flags is None:
             if self.log:
-                self.log.warning(f"[MOUSE] Unsupported button: {button}")
+                self.log.warning("[MOUSE] Unsupported button: %s", button)
             return
+        down, up, data = flags
 
-        # send DOWN
-        inp = INPUT()
-        inp.type = INPUT_MOUSE
-        inp.mi = MOUSEINPUT(0, 0, data, down, 0, None)
-        user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        # DOWN goes out in the same SendInput as anything queued earlier
+        # this frame, which also keeps their order
+        self._queue(down, data)
+        if hold_ms > 0:
+            # DOWN must reach Windows before the hold, batch or not
+            self._send_pending()
+            # keep it pressed for hold_ms
+            time.sleep(hold_ms / 1000.0)
 
-        # keep it pressed for hold_ms
-        import time
-        time.sleep(hold_ms / 1000.0)
-
-        # send UP
-        inp = INPUT()
-        inp.type = INPUT_MOUSE
-        inp.mi = MOUSEINPUT(0, 0, data, up, 0, None)
-        user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(inp))
+        # UP (with hold_ms <= 0: DOWN+UP in one SendInput)
+        self._queue(up, data)
+        self.flush()
 
         if self.log:
-            self.log.debug(f"[MOUSE] Clicked {btn} (held {hold_ms}ms)")
+            self.log.debug("[MOUSE] Clicked %s (held %sms)", btn, hold_ms)
+
+    def click_many(self, buttons):
+        """
+        Full clicks (DOWN+UP, no hold) for several buttons, in order, queued
+        behind earlier events and sent with one SendInput (or with batch()).
+        """
+        for button in buttons:
+            flags = _BUTTON_FLAGS.get(button.upper())
+            if flags is None:
+                if self.log:
+                    self.log.warning("[MOUSE] Unsupported button: %s", button)
+                continue
+            down, up, data = flags
+            self._queue(down, data)
+            self._queue(up, data)
+        self.flush()
 
     # --- Wheel scroll ---
-    def wheel(self, direction: str):
-        """Simulate mouse wheel scroll."""
+    def wheel(self, direction: str, count: int = 1):
+        """Queue `count` mouse wheel notches (sent on flush())."""
         if direction == "WheelUp":
-            user32.mouse_event(MOUSEEVENTF_WHEEL, 0, 0, 120, 0)
+            data = 120
         elif direction == "WheelDown":
-            user32.mouse_event(MOUSEEVENTF_WHEEL, 0, 0, -120, 0)
+            data = -120 & 0xFFFFFFFF  # DWORD field
         else:
-            self.log.warning(f"[MOUSE] Unsupported wheel direction: {direction}")
+            self.log.warning("[MOUSE] Unsupported wheel direction: %s", direction)
             return
-        self.log.debug(f"[MOUSE] Wheel {direction}")
+        for _ in range(count):
+            self._queue(MOUSEEVENTF_WHEEL, data)
+        self.log.debug("[MOUSE] Wheel %s x%d", direction, count)
 
     # --- Window helpers ---
     @staticmethod
@@ -268,27 +481,26 @@ class MouseController:
         hwnd = user32.FindWindowW(class_name, title)
         return hwnd if hwnd else None
 
+    def _window_for(self, title, class_name):
+        """find_window() with the last result per (title, class_name) kept while it lives."""
+        key = (title, class_name)
+        hwnd = self._hwnd_cache.get(key)
+        if hwnd and user32.IsWindow(hwnd):
+            return hwnd
+        hwnd = self.find_window(title=title, class_name=class_name)
+        if hwnd:
+            self._hwnd_cache[key] = hwnd
+        else:
+            self._hwnd_cache.pop(key, None)
+        return hwnd
+
     @staticmethod
     def list_windows():
-        """Return list of (hwnd, class_name, title) for all top-level windows."""
-        windows = []
-
-        @ctypes.WINFUNCTYPE(ctypes.c_bool, wt.HWND, ctypes.POINTER(ctypes.c_int))
-        def foreach_window(hwnd, lParam):
-            if not user32.IsWindowVisible(hwnd):
-                return True
-
-            length = user32.GetWindowTextLengthW(hwnd)
-            title_buf = ctypes.create_unicode_buffer(length + 1)
-            user32.GetWindowTextW(hwnd, title_buf, length + 1)
-
-            class_buf = ctypes.create_unicode_buffer(256)
-            user32.GetClassNameW(hwnd, class_buf, 256)
-
-            windows.append((hwnd, class_buf.value, title_buf.value))
-            return True
-
-        user32.EnumWindows(foreach_window, 0)
+        """Return list of (hwnd, class_name, title) for all visible top-level windows."""
+        _windows_found.clear()
+        user32.EnumWindows(_enum_windows_proc, 0)
+        windows = list(_windows_found)
+        _windows_found.clear()
         return windows
 
     @staticmethod
@@ -299,7 +511,7 @@ class MouseController:
 
     def set_position_window_frac(self, hwnd=None, title=None, class_name=None, fx=0.5, fy=0.5):
         if hwnd is None:
-            hwnd = self.find_window(title=title, class_name=class_name)
+            hwnd = self._window_for(title, class_name)
         if not hwnd:
             return
         x,y,w,h = self.get_window_rect(hwnd)
@@ -1,53 +1,197 @@
 import re
 
+# split only on commas that are NOT inside brackets
+_LIST_RE = re.compile(r",(?![^\[]*\])")
+# inline comment as configparser sees it: ; or # at line start or after whitespace
+_INLINE_COMMENT_RE = re.compile(r"(?<!\S)[;#]")
+_SECTION_RE = re.compile(r"\[(?P<header>.+)\]")
+_OPTION_RE = re.compile(r"(?P<option>.*?)\s*[=:]\s*(?P<value>.*)$")
+_NONSPACE_RE = re.compile(r"\S")
+
+DEFAULT_SECTION = "DEFAULT"
+# configparser's boolean words; anything else is a config error
+_BOOL_STRINGS = {
+    "1": True, "yes": True, "true": True, "on": True,
+    "0": False, "no": False, "false": False, "off": False,
+}
+
+
+def _parse_ini(text: str):
+    """
+    Single-pass INI parse with configparser's rules for the subset we use:
+    [section] headers, key = value / key: value (case preserved), full-line
+    and inline ; / # comments, and indented continuation lines (joined with
+    newlines). Values are taken literally (no % interpolation).
+    Returns ({(section, option): raw}, [sections]).
+    """
+    raw = {}
+    sections = []
+    section = None
+    option = None           # option receiving continuation lines
+    lines = None
+    indent_level = 0
+
+    def finish():
+        if option is not None:
+            raw[(section, option)] = "\n".join(lines).rstrip()
+
+    for lineno, line in enumerate(text.splitlines(), 1):
+        m = _INLINE_COMMENT_RE.search(line)
+        value = (line if m is None else line[:m.start()]).strip()
+        if not value:
+            # blank lines belong to a running value; comment lines do not
+            if m is None and option is not None:
+                lines.append("")
+            continue
+
+        cur_indent = _NONSPACE_RE.search(line).start()
+        if option is not None and cur_indent > indent_level:
+            lines.append(value)
+            continue
+
+        finish()
+        option = None
+        indent_level = cur_indent
+        sm = _SECTION_RE.match(value)
+        if sm:
+            section = sm.group("header")
+            if section != DEFAULT_SECTION and section not in sections:
+                sections.append(section)
+            continue
+        if section is None:
+            raise ValueError(f"INI line {lineno}: option outside of a [section]: {line!r}")
+        om = _OPTION_RE.match(value)
+        if not om or not om.group("option"):
+            raise ValueError(f"INI line {lineno}: expected 'key = value': {line!r}")
+        option = om.group("option").rstrip()
+        lines = [om.group("value").strip()]
+    finish()
+    return raw, sections
+
+
 class IniReader:
-    def __init__(self, path):
+    def __init__(self, path, use_configparser: bool = False):
+        """
+        Read an INI file. The built-in single-pass parser is the default;
+        use_configparser=True reads it with configparser instead (adds %
+        interpolation and strict duplicate checks).
+        """
+        self.path = path
+        self._cfg = None
+        self._raw = None
+        self._sections = ()
+        if use_configparser:
+            self._cfg = self._load_configparser()
+        else:
+            with open(path, encoding="utf-8") as f:
+                self._raw, sections = _parse_ini(f.read())
+            self._sections = frozenset(sections)
+        # cleaned values, filled on first read: (section, option) → str / token tuple
+        # (None marks a missing option)
+        self._str_cache: dict[tuple[str, str], str | None] = {}
+        self._list_cache: dict[tuple[str, str], tuple[str, ...]] = {}
+        # (int|float|bool, section, option) → converted value, None if missing/unparsable
+        self._typed_cache = {}
+
+    def _load_configparser(self):
         import configparser
-        self.cfg = configparser.ConfigParser(inline_comment_prefixes=(";", "#"))
-        self.cfg.optionxform = str  # preserve case
-        self.cfg.read(path, encoding="utf-8")
+        cfg = configparser.ConfigParser(inline_comment_prefixes=(";", "#"))
+        cfg.optionxform = str  # preserve case
+        cfg.read(self.path, encoding="utf-8")
+        return cfg
+
+    @property
+    def cfg(self):
+        """configparser view of the file (built on first use with the fast parser)."""
+        if self._cfg is None:
+            self._cfg = self._load_configparser()
+        return self._cfg
+
+    def _get_raw(self, section: str, option: str):
+        """Uncleaned value of an option, None if it is not set."""
+        if self._raw is None:
+            if self._cfg.has_option(section, option):
+                return self._cfg.get(section, option)
+            return None
+        val = self._raw.get((section, option))
+        if val is None and section in self._sections:
+            val = self._raw.get((DEFAULT_SECTION, option))
+        return val
+
+    def has_option(self, section: str, option: str) -> bool:
+        return self._get_raw(section, option) is not None
 
     def _clean(self, val: str) -> str:
         if val is None:
             return ""
-        # cut at first ; or #
-        for sep in (";", "#"):
-            if sep in val:
-                val = val.split(sep, 1)[0]
-        return val.strip()
+        # cut at first ; or # (two C-level finds, no regex)
+        i = val.find(";")
+        j = val.find("#")
+        if j >= 0 and (i < 0 or j < i):
+            i = j
+        return (val if i < 0 else val[:i]).strip()
 
     def get_str(self, section: str, option: str, fallback: str = "") -> str:
-        if self.cfg.has_option(section, option):
-            raw = self.cfg.get(section, option, fallback=fallback)
-            return self._clean(raw)
-        return fallback
+        key = (section, option)
+        try:
+            val = self._str_cache[key]
+        except KeyError:
+            val = self._get_raw(section, option)
+            if val is not None:
+                val = self._clean(val)
+            self._str_cache[key] = val
+        return fallback if val is None else val
 
-    def get_int(self, section: str, option: str, fallback: int = 0) -> int:
+    def _get_typed(self, kind, section: str, option: str):
+        """
+        Value converted by kind (int / float / bool), memoized. None if missing,
+        or for int/float if unparsable; an unknown bool word raises ValueError.
+        """
+        key = (kind, section, option)
         try:
-            return int(self.get_str(section, option, str(fallback)))
-        except ValueError:
-            return fallback
+            return self._typed_cache[key]
+        except KeyError:
+            pass
+        val = self.get_str(section, option, None)
+        if val is not None:
+            if kind is bool:
+                b = _BOOL_STRINGS.get(val.lower())
+                if b is None:
+                    # like configparser.getboolean: a typo must not silently read as False
+                    raise ValueError(f"Not a boolean: [{section}] {option} = {val!r}")
+                val = b
+            else:
+                try:
+                    val = kind(val)
+                except ValueError:
+                    val = None
+        self._typed_cache[key] = val
+        return val
+
+    def get_int(self, section: str, option: str, fallback: int = 0) -> int:
+        val = self._get_typed(int, section, option)
+        return fallback if val is None else val
 
     def get_float(self, section: str, option: str, fallback: float = 0.0) -> float:
-        try:
-            return float(self.get_str(section, option, str(fallback)))
-        except ValueError:
-            return fallback
+        val = self._get_typed(float, section, option)
+        return fallback if val is None else val
 
     def get_bool(self, section: str, option: str, fallback: bool = False) -> bool:
-        val = self.get_str(section, option, str(fallback))
-        return val.lower() in ("1", "yes", "true", "on")
+        """1/yes/true/on or 0/no/false/off (any case); raises ValueError on anything else."""
+        val = self._get_typed(bool, section, option)
+        return fallback if val is None else val
 
     def get_list(self, section: str, option: str):
-        if not self.cfg.has_option(section, option):
-            return []
-        raw = self.cfg.get(section, option, fallback="")
-
-        # Handle line continuations like "\" in INI
-        joined = raw.replace("\\\n", " ").replace("\\", " ")
-
-        # Split only on commas that are NOT inside brackets
-        tokens = re.split(r",(?![^\[]*\])", joined)
-
-        return [t.strip() for t in tokens if t.strip()]
+        """Comma-separated tokens (commas inside [...] kept); split once, a fresh list per call."""
+        key = (section, option)
+        tokens = self._list_cache.get(key)
+        if tokens is None:
+            tokens = ()
+            raw = self._get_raw(section, option)
+            if raw is not None:
+                # Handle line continuations like "\" in INI
+                joined = raw.replace("\\\n", " ").replace("\\", " ")
 
+                tokens = tuple(t for t in map(str.strip, _LIST_RE.split(joined)) if t)
+            self._list_cache[key] = tokens
+        return list(tokens)
@@ -2,14 +2,63 @@
 """
 logger.py
 Console = compact (INFO), optional colors
-File    = detailed (DEBUG), overwritten each run
+File    = detailed (DEBUG), overwritten each run; written by a background
+          QueueListener so callers only enqueue
 """
 
-import colorama
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+try:
+    from colorama import Fore, Style, init as colorama_init
+    _HAS_COLOR = True
+except ImportError:
+    _HAS_COLOR = False
+_colorama_ready = False
+
+
+class SecondCachedFormatter(logging.Formatter):
+    """
+    Formatter that runs strftime once per second when a datefmt is set;
+    msecs then come from the format string (%(msecs)03d).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stamp = (None, "")  # (whole second, formatted time)
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt is None:
+            # default format appends ,msecs itself: nothing per-second to reuse
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        cached_sec, stamp = self._stamp
+        if sec != cached_sec:
+            stamp = super().formatTime(record, datefmt)
+            self._stamp = (sec, stamp)
+        return stamp
+
+
+if _HAS_COLOR:
+    _LEVEL_COLORS = {
+        "DEBUG": Fore.BLUE,
+        "INFO": Fore.GREEN,
+        "WARNING": Fore.YELLOW,
+        "ERROR": Fore.RED,
+        "CRITICAL": Fore.RED + Style.BRIGHT,
+    }
+
+    class ColorFormatter(SecondCachedFormatter):
+        def format(self, record):
+            base = super().format(record)
+            color = _LEVEL_COLORS.get(record.levelname, "")
+            return f"{color}{base}{Style.RESET_ALL}"
+
+
 def setup_logger(
         name: str = "dcsmouse",
         logfile: str = "dcsmouse.log",
@@ -19,6 +68,7 @@ def setup_logger(
         file_level: int = logging.DEBUG,
         color_console: bool = True,
 ) -> logging.Logger:
+    global _colorama_ready
 
     logger = logging.getLogger(name)
     # Set logger level to the lower of the two so nothing gets filtered too early
@@ -29,7 +79,7 @@ def setup_logger(
         return logger
 
     # --- Formatters ---
-    file_formatter = logging.Formatter(
+    file_formatter = SecondCachedFormatter(
         fmt="%(asctime)s.%(msecs)03d [%(levelname)-8s] %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
@@ -37,33 +87,16 @@ def setup_logger(
     console_fmt = "%(asctime)s.%(msecs)03d [%(levelname)-5s] %(message)s"
     console_datefmt = "%Y-%m-%d %H:%M:%S"
 
-    # Try to add colors, but fall back silently if unavailable
+    # Colors only on a real terminal with colorama available
     console_formatter = None
-    if color_console:
-        try:
-            from colorama import Fore, Style, init as colorama_init
+    if color_console and _HAS_COLOR and sys.stdout is not None and sys.stdout.isatty():
+        if not _colorama_ready:
             colorama_init()
-
-            class ColorFormatter(logging.Formatter):
-                COLORS = {
-                    "DEBUG": Fore.BLUE,
-                    "INFO": Fore.GREEN,
-                    "WARNING": Fore.YELLOW,
-                    "ERROR": Fore.RED,
-                    "CRITICAL": Fore.RED + Style.BRIGHT,
-                }
-                def format(self, record):
-                    base = super().format(record)
-                    color = self.COLORS.get(record.levelname, "")
-                    reset = Style.RESET_ALL
-                    return f"{color}{base}{reset}"
-
-            console_formatter = ColorFormatter(console_fmt, datefmt=console_datefmt)
-        except Exception:
-            pass
+            _colorama_ready = True
+        console_formatter = ColorFormatter(console_fmt, datefmt=console_datefmt)
 
     if console_formatter is None:
-        console_formatter = logging.Formatter(console_fmt, datefmt=console_datefmt)
+        console_formatter = SecondCachedFormatter(console_fmt, datefmt=console_datefmt)
 
     # --- File handler (overwrite) ---
     log_path = Path(logfile)
@@ -71,7 +104,17 @@ def setup_logger(
     file_handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
     file_handler.setFormatter(file_formatter)
     file_handler.setLevel(file_level)
-    logger.addHandler(file_handler)
+
+    # callers only enqueue; the listener thread owns the file and does the I/O
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(file_level)
+    logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    logger._listener = listener
+    # drain queued records before logging.shutdown closes the file
+    atexit.register(listener.stop)
 
     # --- Console handler ---
     if console:
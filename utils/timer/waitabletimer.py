@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+waitabletimer.py
+High-resolution sleeping on Windows.
+Uses a waitable timer (high-resolution variant on Win10 1803+) so short
+frame sleeps (e.g. 4 ms at 250 Hz) are not rounded up to the 15.6 ms
+default scheduler tick. Falls back to time.sleep() if no timer is available.
+"""
+
+import ctypes
+import ctypes.wintypes as wt
+import time
+
+kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+winmm = ctypes.WinDLL("winmm")
+
+# --- constants ---
+CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x00000002
+TIMER_ALL_ACCESS = 0x1F0003
+INFINITE = 0xFFFFFFFF
+
+# --- prototypes ---
+kernel32.CreateWaitableTimerExW.argtypes = [ctypes.c_void_p, wt.LPCWSTR, wt.DWORD, wt.DWORD]
+kernel32.CreateWaitableTimerExW.restype = wt.HANDLE
+kernel32.SetWaitableTimer.argtypes = [
+    wt.HANDLE, ctypes.POINTER(wt.LARGE_INTEGER), wt.LONG,
+    ctypes.c_void_p, ctypes.c_void_p, wt.BOOL,
+]
+kernel32.SetWaitableTimer.restype = wt.BOOL
+kernel32.WaitForSingleObject.argtypes = [wt.HANDLE, wt.DWORD]
+kernel32.WaitForSingleObject.restype = wt.DWORD
+kernel32.CloseHandle.argtypes = [wt.HANDLE]
+kernel32.CloseHandle.restype = wt.BOOL
+
+
+def begin_timer_resolution(ms: int = 1) -> bool:
+    """Request a finer system timer resolution (pair with end_timer_resolution)."""
+    try:
+        return winmm.timeBeginPeriod(ms) == 0  # TIMERR_NOERROR
+    except Exception:
+        return False
+
+
+def end_timer_resolution(ms: int = 1):
+    """Release a resolution requested by begin_timer_resolution()."""
+    try:
+        winmm.timeEndPeriod(ms)
+    except Exception:
+        pass
+
+
+class WaitableTimer:
+    def __init__(self):
+        """
+        Create a timer owned by the calling thread.
+        High-resolution timer preferred, plain waitable timer otherwise.
+        """
+        handle = kernel32.CreateWaitableTimerExW(
+            None, None, CREATE_WAITABLE_TIMER_HIGH_RESOLUTION, TIMER_ALL_ACCESS
+        )
+        if not handle:
+            handle = kernel32.CreateWaitableTimerExW(None, None, 0, TIMER_ALL_ACCESS)
+        self.handle = handle
+        self._due = wt.LARGE_INTEGER()
+
+    def sleep(self, seconds: float):
+        """Block the calling thread for `seconds` (no busy-wait)."""
+        if seconds <= 0:
+            return
+        if not self.handle:
+            time.sleep(seconds)
+            return
+        # negative due time = relative, in 100 ns units
+        self._due.value = -int(seconds * 10_000_000)
+        if not kernel32.SetWaitableTimer(self.handle, ctypes.byref(self._due), 0, None, None, False):
+            time.sleep(seconds)
+            return
+        kernel32.WaitForSingleObject(self.handle, INFINITE)
+
+    def close(self):
+        if self.handle:
+            kernel32.CloseHandle(self.handle)
+            self.handle = None